@@ -1,7 +1,8 @@
 # agent_interfaces.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterator
+import numpy as np
 
 class TradingSignal(BaseModel):
     date: datetime
@@ -11,8 +12,7 @@ class TradingSignal(BaseModel):
     limit_price: Optional[float] = None  # Optional limit price for order execution
     source: str = "default"  # Indicates which agent generated the signal
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MarketData(BaseModel):
     date: datetime
@@ -22,8 +22,48 @@ class MarketData(BaseModel):
     close: float
     volume: int
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+class MarketDataFrame:
+    """
+    Columnar batch of MarketData bars: one NumPy array per field instead of
+    one object per bar. Indexing with an int builds a MarketData on demand,
+    slicing returns another MarketDataFrame sharing the same arrays.
+    """
+    __slots__ = ("date", "open", "high", "low", "close", "volume")
+
+    def __init__(self, date, open, high, low, close, volume):
+        self.date = np.asarray(date)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+        if not (len(self.date) == len(self.open) == len(self.high) == len(self.low)
+                == len(self.close) == len(self.volume)):
+            raise ValueError("MarketDataFrame columns must all have the same length")
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MarketDataFrame(*(getattr(self, field)[index] for field in self.__slots__))
+        date = self.date[index]
+        if isinstance(date, np.datetime64):
+            date = date.astype("datetime64[us]").item()
+        return MarketData(
+            date=date,
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=int(self.volume[index])
+        )
+
+    def __iter__(self) -> Iterator[MarketData]:
+        for index in range(len(self)):
+            yield self[index]
 
 class SentimentResult(BaseModel):
     date: datetime
@@ -32,8 +72,7 @@ class SentimentResult(BaseModel):
     confidence: float       # Confidence level (0.0 to 1.0)
     text_snippet: Optional[str] = None  # Optional snippet of the analyzed text
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SatelliteData(BaseModel):
     date: datetime
@@ -42,8 +81,7 @@ class SatelliteData(BaseModel):
     value: float
     confidence: float  # Confidence level (0.0 to 1.0)
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TradeExecution(BaseModel):
     date: datetime
@@ -55,8 +93,7 @@ class TradeExecution(BaseModel):
     status: str  # "PENDING", "EXECUTED", "FAILED"
     execution_id: Optional[str] = None
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Position(BaseModel):
     symbol: str
@@ -96,8 +133,7 @@ class RiskParameters(BaseModel):
     stop_loss_percent: float  # Default stop loss as % of entry price
     take_profit_percent: float  # Default take profit as % of entry price
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class BacktestResult(BaseModel):
     start_date: datetime
@@ -122,8 +158,7 @@ class BacktestResult(BaseModel):
     def profit_loss_percent(self) -> float:
         return (self.final_capital - self.initial_capital) / self.initial_capital * 100
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OptionsContractData(BaseModel):
@@ -138,8 +173,7 @@ class OptionsContractData(BaseModel):
     vega: Optional[float]
     last_traded_price: Optional[float]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class OptionsChainData(BaseModel):
@@ -147,9 +181,9 @@ class OptionsChainData(BaseModel):
     spot_price: float  # current price of the underlying asset
     expiry_date: datetime
     contracts: List[OptionsContractData]  # a list of OptionsContractData objects
+    contract_expiry: Optional[datetime] = None  # expiry of the listed contracts, when it differs from expiry_date
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class VolatilitySmirkResult(BaseModel):
@@ -161,5 +195,4 @@ class VolatilitySmirkResult(BaseModel):
     confidence: float  # confidence in the sentiment_label, 0.0 to 1.0
     details: Optional[Dict[str, Any]]  # for any additional parameters or raw data
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
@@ -3,11 +3,11 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy.interpolate import griddata
+from scipy.interpolate import RBFInterpolator
 
 logger = logging.getLogger(__name__)
 
@@ -22,58 +22,172 @@ class OptionRecord:
     gamma: float
 
 
+def _sample_moments(values: np.ndarray) -> Tuple[float, float, float]:
+    """Mean, skew and excess kurtosis from one pass of central moments.
+
+    Uses the same bias-corrected estimators as ``Series.skew``/``Series.kurtosis``
+    so results match pandas, without pandas re-deriving the mean per statistic.
+    """
+    values = values[~np.isnan(values)]
+    n = values.size
+    if n == 0:
+        return np.nan, np.nan, np.nan
+    mean = float(values.mean())
+    deviations = values - mean
+    squared = deviations * deviations
+    m2 = squared.mean()
+    m3 = (squared * deviations).mean()
+    m4 = (squared * squared).mean()
+    skew = kurtosis = np.nan
+    if n >= 3:
+        skew = 0.0 if m2 <= 1e-14 else np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2**1.5
+    if n >= 4:
+        kurtosis = 0.0 if m2 <= 1e-14 else (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * m4 / (m2 * m2) - 3 * (n - 1))
+    return mean, float(skew), float(kurtosis)
+
+
+_REGIME_LABELS = ["bearish", "neutral", "bullish"]
+
+
+def _window_sum(values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Sum ``values[lower[i]:upper[i]]`` for every ``i`` using one prefix sum."""
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    return prefix[upper] - prefix[lower]
+
+
+def _to_datetime64(values: Iterable) -> np.ndarray:
+    """Normalise expiries to naive UTC ``datetime64[ns]`` values."""
+    index = pd.DatetimeIndex(pd.to_datetime(list(values)))
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.to_numpy(dtype="datetime64[ns]")
+
+
 class SmirkAnalyzer:
-    """Compute higher-order statistics for the volatility smirk."""
+    """Compute higher-order statistics for the volatility smirk.
+
+    Records are stored column-wise as NumPy arrays (``expiry``, ``strike``,
+    ``iv``, ``delta``, ``gamma``); the pandas view in :attr:`df` is only built
+    when a caller asks for it.
+    """
 
     def __init__(self, records: Iterable[Dict]) -> None:
-        self.df = pd.DataFrame(list(records))
-        if self.df.empty:
+        rows = list(records)
+        self._df: Optional[pd.DataFrame] = None
+        self._surface_interp: Optional[Tuple[RBFInterpolator, np.ndarray, np.ndarray]] = None
+        expiry = _to_datetime64(row.get("expiry") for row in rows)
+        strike = np.array([row.get("strike") for row in rows], dtype=np.float64)
+        # Keep everything sorted by (expiry, strike) so a single expiry is a
+        # contiguous run that can be located with a binary search.
+        order = np.lexsort((strike, expiry))
+        self._records = [rows[i] for i in order]
+        self.expiry = expiry[order]
+        self.strike = strike[order]
+        self.iv = np.array([row.get("iv") for row in self._records], dtype=np.float64)
+        self.delta = np.array([row.get("delta") for row in self._records], dtype=np.float64)
+        self.gamma = np.array([row.get("gamma") for row in self._records], dtype=np.float64)
+        if not rows:
             logger.warning("SmirkAnalyzer initialised with no records")
-            return
-        for column in ("expiry",):
-            if column in self.df:
-                self.df[column] = pd.to_datetime(self.df[column])
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Row-oriented view of the records, built lazily."""
+        if self._df is None:
+            df = pd.DataFrame(self._records)
+            if "expiry" in df:
+                df["expiry"] = self.expiry
+            self._df = df
+        return self._df
+
+    def _expiry_bounds(self, expiry: pd.Timestamp) -> Tuple[int, int]:
+        target = _to_datetime64([expiry])[0]
+        lower = int(np.searchsorted(self.expiry, target, side="left"))
+        upper = int(np.searchsorted(self.expiry, target, side="right"))
+        return lower, upper
 
     def surface_slice(self, expiry: pd.Timestamp) -> pd.DataFrame:
-        """Return all instruments for the given expiry."""
-        if self.df.empty:
+        """Return all instruments for the given expiry, ordered by strike."""
+        if not self._records:
             return self.df
-        mask = self.df["expiry"] == pd.Timestamp(expiry)
-        return self.df.loc[mask].sort_values("strike")
+        lower, upper = self._expiry_bounds(expiry)
+        return self.df.iloc[lower:upper]
 
     def calculate_moments(self, expiry: pd.Timestamp) -> Dict[str, float]:
         """Calculate statistical moments of IV distribution for an expiry."""
-        data = self.surface_slice(expiry)
-        if data.empty:
+        lower, upper = self._expiry_bounds(expiry)
+        if lower == upper:
             return {"mean": np.nan, "skew": np.nan, "kurtosis": np.nan}
-        iv = data["iv"].astype(float)
-        return {
-            "mean": float(iv.mean()),
-            "skew": float(iv.skew()),
-            "kurtosis": float(iv.kurtosis()),
-        }
+        mean, skew, kurtosis = _sample_moments(self.iv[lower:upper])
+        return {"mean": mean, "skew": skew, "kurtosis": kurtosis}
 
     def fit_vol_surface(self) -> pd.DataFrame:
         """Fit a smooth surface of implied vol vs strike/tenor."""
-        if self.df.empty:
+        if not self._records:
             return self.df
-        expiries = (self.df["expiry"] - self.df["expiry"].min()).dt.days.astype(float)
-        strikes = self.df["strike"].astype(float)
-        iv = self.df["iv"].astype(float)
-        grid_x, grid_y = np.mgrid[strikes.min():strikes.max():100j, expiries.min():expiries.max():100j]
-        surface = griddata((strikes, expiries), iv, (grid_x, grid_y), method="cubic")
-        return pd.DataFrame({"strike": grid_x.flatten(), "tenor_days": grid_y.flatten(), "iv": surface.flatten()})
+        valid = ~np.isnat(self.expiry)
+        expiries = (self.expiry - self.expiry[valid].min()).astype("timedelta64[D]").astype(np.float64)
+        strikes = self.strike
+        if self._surface_interp is None:
+            self._surface_interp = self._build_surface_interpolator(strikes, expiries)
+        interp, lower, span = self._surface_interp
+        grid_x, grid_y = np.mgrid[
+            np.nanmin(strikes):np.nanmax(strikes):100j,
+            np.nanmin(expiries):np.nanmax(expiries):100j,
+        ]
+        points = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+        surface = interp((points - lower) / span)
+        return pd.DataFrame({"strike": grid_x.flatten(), "tenor_days": grid_y.flatten(), "iv": surface})
+
+    def _build_surface_interpolator(
+        self, strikes: np.ndarray, expiries: np.ndarray
+    ) -> Tuple[RBFInterpolator, np.ndarray, np.ndarray]:
+        # Calls and puts share strikes, so average duplicate nodes before
+        # fitting; the RBF system is singular with repeated coordinates.
+        nodes = pd.DataFrame({"strike": strikes, "tenor": expiries, "iv": self.iv})
+        nodes = nodes.dropna().groupby(["strike", "tenor"], as_index=False)["iv"].mean()
+        coords = nodes[["strike", "tenor"]].to_numpy()
+        # Scale both axes to [0, 1] so strike (tens of thousands) does not
+        # swamp tenor (days) in the radial distance.
+        lower = coords.min(axis=0)
+        span = np.where(np.ptp(coords, axis=0) > 0, np.ptp(coords, axis=0), 1.0)
+        interp = RBFInterpolator((coords - lower) / span, nodes["iv"].to_numpy(), kernel="thin_plate_spline")
+        return interp, lower, span
 
     def detect_regimes(self, window: int = 5) -> pd.DataFrame:
         """Detect IV regime changes based on rolling z-scores."""
-        if self.df.empty:
+        if not self._records:
             return self.df
         df = self.df.copy()
-        df = df.sort_values(["expiry", "strike"])
-        df["rolling_mean"] = df.groupby("expiry")["iv"].transform(lambda s: s.rolling(window, min_periods=1).mean())
-        df["rolling_std"] = df.groupby("expiry")["iv"].transform(lambda s: s.rolling(window, min_periods=1).std())
-        df["z_score"] = (df["iv"] - df["rolling_mean"]) / df["rolling_std"].replace(0, np.nan)
-        df["regime"] = pd.cut(df["z_score"], bins=[-np.inf, -1.5, 1.5, np.inf], labels=["bearish", "neutral", "bullish"])
+        iv = self.iv
+        positions = np.arange(iv.size)
+        # Records are sorted by (expiry, strike), so each expiry is a
+        # contiguous run; rolling windows are clipped at the run start and
+        # evaluated from prefix sums instead of per-group rolling calls.
+        run_start = np.r_[True, self.expiry[1:] != self.expiry[:-1]]
+        group_start = np.maximum.accumulate(np.where(run_start, positions, 0))
+        lower = np.maximum(group_start, positions - window + 1)
+        upper = positions + 1
+        valid = ~np.isnan(iv)
+        values = np.where(valid, iv, 0.0)
+        count = _window_sum(valid.astype(np.float64), lower, upper)
+        total = _window_sum(values, lower, upper)
+        total_sq = _window_sum(values * values, lower, upper)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+            variance = np.where(count > 1, (total_sq - count * mean * mean) / (count - 1), np.nan)
+            # Prefix-sum differences leave rounding noise where the window is flat.
+            variance = np.where(variance < 1e-14, 0.0, variance)
+            std = np.sqrt(variance)
+            no_expiry = np.isnat(self.expiry)
+            mean[no_expiry] = np.nan
+            std[no_expiry] = np.nan
+            z_score = (iv - mean) / np.where(std == 0, np.nan, std)
+        codes = np.digitize(z_score, [-1.5, 1.5], right=True)
+        codes[np.isnan(z_score)] = -1
+        df["rolling_mean"] = mean
+        df["rolling_std"] = std
+        df["z_score"] = z_score
+        df["regime"] = pd.Categorical.from_codes(codes, categories=_REGIME_LABELS, ordered=True)
         return df
 
 
@@ -81,13 +195,18 @@ def compute_smirk_features(records: Iterable[Dict]) -> Dict[str, float]:
     """Convenience helper returning aggregated analytics for pipelines."""
     analyzer = SmirkAnalyzer(records)
     results: Dict[str, float] = {}
-    for expiry in analyzer.df.get("expiry", pd.Series(dtype="datetime64[ns]")).unique():
-        if pd.isna(expiry):
-            continue
-        moments = analyzer.calculate_moments(expiry)
-        results[f"{pd.Timestamp(expiry).date()}_mean"] = moments["mean"]
-        results[f"{pd.Timestamp(expiry).date()}_skew"] = moments["skew"]
-        results[f"{pd.Timestamp(expiry).date()}_kurtosis"] = moments["kurtosis"]
+    # Records are sorted by expiry, so each expiry is one contiguous run.
+    expiries = analyzer.expiry[~np.isnat(analyzer.expiry)]
+    if expiries.size == 0:
+        return results
+    starts = np.flatnonzero(np.r_[True, expiries[1:] != expiries[:-1]])
+    for start, iv in zip(starts, np.split(analyzer.iv[: expiries.size], starts[1:])):
+        expiry = expiries[start]
+        mean, skew, kurtosis = _sample_moments(iv)
+        label = pd.Timestamp(expiry).date()
+        results[f"{label}_mean"] = mean
+        results[f"{label}_skew"] = skew
+        results[f"{label}_kurtosis"] = kurtosis
     return results
 
 
@@ -0,0 +1,68 @@
+"""Compiled inner loops for the backtesting engine.
+
+Numba is optional: without it the kernels fall back to equivalent NumPy
+expressions so results are identical, only slower on large scans.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - exercised when numba is not installed
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def run_equity(signals: np.ndarray, rets: np.ndarray) -> np.ndarray:
+        equity = np.empty_like(rets)
+        acc = 1.0
+        for i in range(rets.size):
+            acc *= 1.0 + signals[i] * rets[i]
+            equity[i] = acc
+        return equity
+
+    @njit(cache=True)
+    def summarize(equity: np.ndarray) -> Tuple[float, float, float]:
+        running_max = equity[0]
+        worst = 0.0
+        total = 0.0
+        total_sq = 0.0
+        for i in range(1, equity.size):
+            ret = equity[i] / equity[i - 1] - 1.0
+            total += ret
+            total_sq += ret * ret
+            if equity[i] > running_max:
+                running_max = equity[i]
+            drawdown = equity[i] / running_max - 1.0
+            if drawdown < worst:
+                worst = drawdown
+        count = equity.size - 1
+        sharpe = np.nan
+        if count > 1:
+            mean = total / count
+            variance = max((total_sq - count * mean * mean) / (count - 1), 0.0)
+            sharpe = mean / (np.sqrt(variance) + 1e-9) * np.sqrt(252.0)
+        return equity[equity.size - 1] - 1.0, worst, sharpe
+
+else:  # pragma: no cover - exercised when numba is not installed
+
+    def run_equity(signals: np.ndarray, rets: np.ndarray) -> np.ndarray:
+        return np.cumprod(1.0 + signals * rets)
+
+    def summarize(equity: np.ndarray) -> Tuple[float, float, float]:
+        drawdown = float(min((equity / np.maximum.accumulate(equity) - 1.0).min(), 0.0))
+        rets = equity[1:] / equity[:-1] - 1.0
+        sharpe = np.nan
+        if rets.size > 1:
+            sharpe = rets.mean() / (rets.std(ddof=1) + 1e-9) * np.sqrt(252.0)
+        return float(equity[-1] - 1.0), drawdown, float(sharpe)
+
+
+__all__ = ["NUMBA_AVAILABLE", "run_equity", "summarize"]
@@ -3,11 +3,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable, Iterable, List
+from typing import Any, Callable, Iterable, List
 
 import numpy as np
 import pandas as pd
 
+from ._kernels import run_equity, summarize
+
 
 @dataclass
 class BacktestWindow:
@@ -26,24 +28,44 @@ def walk_forward_windows(history: pd.DataFrame, train_days: int, test_days: int)
     return windows
 
 
-def evaluate_strategy(history: pd.DataFrame, signal_fn: Callable[[pd.Series], float]) -> pd.DataFrame:
-    equity_curve = [1.0]
-    returns = []
-    for _, row in history.iterrows():
-        signal = signal_fn(row)
-        daily_return = signal * row.get("return", 0.0)
-        returns.append(daily_return)
-        equity_curve.append(equity_curve[-1] * (1 + daily_return))
-    return pd.DataFrame({"equity": equity_curve[1:], "return": returns}, index=history.index)
+def evaluate_strategy(
+    history: pd.DataFrame,
+    signal_fn: Callable[..., Any],
+    *,
+    vectorized: bool = False,
+) -> pd.DataFrame:
+    """Apply ``signal_fn`` to ``history`` and compound the resulting returns.
+
+    By default ``signal_fn`` receives one row at a time. Pass ``vectorized=True``
+    when it accepts the whole frame and returns one signal per row, which skips
+    the per-row Python calls entirely.
+    """
+    if history.empty:
+        return pd.DataFrame({"equity": [], "return": []}, index=history.index, dtype=float)
+    if vectorized:
+        signals = np.asarray(signal_fn(history), dtype=np.float64)
+    else:
+        signals = history.apply(signal_fn, axis=1).to_numpy(dtype=np.float64)
+    if "return" in history:
+        asset_returns = history["return"].to_numpy(dtype=np.float64)
+    else:
+        asset_returns = np.zeros(len(history), dtype=np.float64)
+    signals = np.ascontiguousarray(signals)
+    asset_returns = np.ascontiguousarray(asset_returns)
+    returns = signals * asset_returns
+    equity = run_equity(signals, asset_returns)
+    return pd.DataFrame({"equity": equity, "return": returns}, index=history.index)
 
 
 def performance_summary(equity: pd.Series) -> dict:
-    total_return = equity.iloc[-1] - 1
-    drawdowns = equity / equity.cummax() - 1
-    sharpe = (equity.pct_change().mean() / (equity.pct_change().std() + 1e-9)) * np.sqrt(252)
+    """Total return, max drawdown and annualised Sharpe in a single pass over ``equity``."""
+    values = np.ascontiguousarray(equity.to_numpy(dtype=np.float64))
+    if values.size == 0:
+        raise ValueError("performance_summary requires a non-empty equity curve")
+    total_return, max_dd, sharpe = summarize(values)
     return {
         "total_return": float(total_return),
-        "max_drawdown": float(drawdowns.min()),
+        "max_drawdown": float(max_dd),
         "sharpe": float(sharpe),
     }
 
@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict
 
-from pydantic import BaseModel, BaseSettings, Field, ValidationError
+from pydantic import BaseModel, Field, ValidationError
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class DataConfig(BaseModel):
@@ -30,18 +30,14 @@ class AppConfig(BaseSettings):
     strategy: StrategySettings = Field(default_factory=StrategySettings)
     risk: RiskSettings = Field(default_factory=RiskSettings)
 
-    class Config:
-        env_prefix = "BOT_"
-        case_sensitive = False
+    model_config = SettingsConfigDict(env_prefix="BOT_", case_sensitive=False)
 
 
 def load_config(path: Path | str) -> AppConfig:
-    raw: Dict[str, Any] = {}
     path = Path(path)
-    if path.exists():
-        raw = AppConfig.parse_file(path)
-        return raw
     try:
+        if path.exists():
+            return AppConfig.model_validate_json(path.read_bytes())
         return AppConfig()
     except ValidationError as exc:  # pragma: no cover - pydantic handles messaging
         raise RuntimeError(f"Invalid configuration: {exc}") from exc
@@ -7,30 +7,125 @@ import logging
 import os
 import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import requests
+from pydantic import BaseModel, ValidationError
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised when httpx is not installed
+    httpx = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - exercised when xxhash is not installed
+    xxhash = None
 
 from agent_interfaces import OptionsChainData, OptionsContractData
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+_EXPIRY_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S%z")
+
+
+@lru_cache(maxsize=1024)
+def _parse_absolute_expiry(text: str) -> Optional[datetime]:
+    """Parse an ISO-style expiry date, trying ``fromisoformat`` before ``strptime``.
+
+    Relative tenors such as ``"7D"`` depend on the current time and are
+    resolved by the caller, so only absolute dates are memoised here.
+    """
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in _EXPIRY_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _build_session(pool_size: int) -> "httpx.Client | requests.Session":
+    """Create a keep-alive HTTP session with room for ``pool_size`` concurrent requests.
+
+    Prefers an HTTP/2 ``httpx.Client`` so concurrent book-summary requests are
+    multiplexed over one connection; falls back to a pooled ``requests.Session``.
+    """
+    if httpx is not None:
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        try:
+            return httpx.Client(http2=True, limits=limits)
+        except ImportError:  # pragma: no cover - httpx installed without the h2 extra
+            return httpx.Client(limits=limits)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing bursts of ``capacity`` requests at ``rate`` per second."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
 class DeribitAPIError(RuntimeError):
     """Raised when the Deribit API returns an error response."""
 
 
-@dataclass
-class _CacheEntry:
-    payload: List[Dict[str, Any]]
+class _CachedChains(BaseModel):
+    """Cache envelope validated straight from the JSON bytes on disk."""
+
     stored_at: float
+    payload: List[OptionsChainData]
 
 
 class OnDiskCache:
-    """Simple JSON cache with TTL semantics."""
+    """Simple JSON cache with TTL semantics, encoded with orjson when available."""
 
     def __init__(self, cache_dir: Path, ttl: int) -> None:
         self._cache_dir = cache_dir
@@ -39,25 +134,56 @@ class OnDiskCache:
         self._cache_dir.mkdir(parents=True, exist_ok=True)
 
     def _path_for(self, key: str) -> Path:
-        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        # Keys only need to be spread across file names, not be tamper-proof.
+        encoded = key.encode("utf-8")
+        if xxhash is not None:
+            digest = xxhash.xxh3_64_hexdigest(encoded)
+        else:
+            digest = hashlib.blake2b(encoded, digest_size=16).hexdigest()
         return self._cache_dir / f"{digest}.json"
 
-    def load(self, key: str) -> Optional[_CacheEntry]:
+    def is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at <= self._ttl
+
+    def load_raw(self, key: str) -> Optional[bytes]:
+        """Return the raw envelope bytes for ``key`` without decoding them."""
         path = self._path_for(key)
         if not path.exists():
             return None
         try:
-            with path.open("r", encoding="utf-8") as handle:
-                raw = json.load(handle)
-        except (OSError, json.JSONDecodeError):
+            return path.read_bytes()
+        except OSError:
             logger.warning("Failed to read cache file at %s", path)
             return None
-        if time.time() - raw.get("stored_at", 0) > self._ttl:
-            return None
-        payload = raw.get("payload")
-        if not isinstance(payload, list):
-            return None
-        return _CacheEntry(payload=payload, stored_at=raw["stored_at"])
+
+    def touch(self, key: str) -> None:
+        """Mark ``key`` as recently used so :meth:`prune` evicts it last."""
+        try:
+            os.utime(self._path_for(key))
+        except OSError:
+            pass
+
+    def prune(self, max_bytes: int) -> int:
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for path in self._cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
 
     def store(self, key: str, payload: List[Dict[str, Any]]) -> None:
         path = self._path_for(key)
@@ -65,8 +191,7 @@ class OnDiskCache:
         tmp_path = path.with_suffix(".tmp")
         with self._lock:
             try:
-                with tmp_path.open("w", encoding="utf-8") as handle:
-                    json.dump(envelope, handle)
+                tmp_path.write_bytes(_dumps(envelope))
                 tmp_path.replace(path)
             except OSError:
                 logger.warning("Failed to persist cache file at %s", path)
@@ -86,14 +211,23 @@ class DeribitMarketDataClient:
         cache_ttl: int = 300,
         rate_limit_per_sec: Optional[float] = 10.0,
         timeout: int = 10,
-        session: Optional[requests.Session] = None,
+        session: Optional["httpx.Client | requests.Session"] = None,
+        max_workers: int = 8,
+        bulk_book_summary: bool = True,
+        strict: bool = False,
     ) -> None:
         self.client_id = client_id or os.getenv("DERIBIT_CLIENT_ID")
         self.client_secret = client_secret or os.getenv("DERIBIT_CLIENT_SECRET")
-        self._session = session or requests.Session()
+        self._max_workers = max(1, max_workers)
+        self._owns_session = session is None
+        self._session = session or _build_session(pool_size=max(self._max_workers, 10))
         self._timeout = timeout
-        self._rate_limit_per_sec = rate_limit_per_sec
-        self._last_request_ts = 0.0
+        self._rate_limiter = TokenBucket(rate_limit_per_sec) if rate_limit_per_sec else None
+        self._bulk_book_summary = bulk_book_summary
+        # Deribit payloads are already typed, so models are built with
+        # ``model_construct`` unless strict validation is requested.
+        self._contract_factory = OptionsContractData if strict else OptionsContractData.model_construct
+        self._chain_factory = OptionsChainData if strict else OptionsChainData.model_construct
         cache_dir = cache_dir or Path(".cache") / "deribit"
         self._cache = OnDiskCache(cache_dir, cache_ttl)
         self._token: Optional[str] = None
@@ -102,6 +236,11 @@ class DeribitMarketDataClient:
     # ------------------------------------------------------------------
     # Public methods
     # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Close the pooled HTTP session, unless it was supplied by the caller."""
+        if self._owns_session:
+            self._session.close()
+
     def fetch_options_chain(
         self,
         *,
@@ -123,12 +262,17 @@ class DeribitMarketDataClient:
         )
 
         if not refresh:
-            cached = self._cache.load(cache_key)
-            if cached:
+            cached = self._load_cached_chains(cache_key)
+            if cached is not None:
                 logger.debug("Serving Deribit options chain from cache")
-                return [self._parse_options_chain(item) for item in cached.payload]
+                return cached
 
-        instruments = self._get_instruments(currency=currency, kind=kind)
+        summary_by_name: Optional[Dict[str, Dict[str, Any]]] = None
+        if self._bulk_book_summary:
+            instruments, summaries = self._get_instruments_and_summaries(currency=currency, kind=kind)
+            summary_by_name = {row["instrument_name"]: row for row in summaries}
+        else:
+            instruments = self._get_instruments(currency=currency, kind=kind)
         grouped = self._group_instruments_by_expiry(instruments)
 
         result: List[OptionsChainData] = []
@@ -137,33 +281,41 @@ class DeribitMarketDataClient:
             if not bucket:
                 logger.warning("No Deribit instruments found for expiry %s", requested_expiry.date())
                 continue
-            contracts: List[OptionsContractData] = []
-            spot_price: Optional[float] = None
-            for instrument in sorted(bucket, key=lambda item: item["strike"]):
-                summary = self._get_book_summary(instrument["instrument_name"])
-                payload = summary[0] if summary else {}
-                spot_price = payload.get("underlying_price") or spot_price
-                contracts.append(
-                    OptionsContractData(
-                        strike_price=instrument["strike"],
-                        contract_type=instrument["option_type"],
-                        implied_volatility=payload.get("mark_iv"),
-                        volume=payload.get("volume"),
-                        open_interest=payload.get("open_interest"),
-                        delta=payload.get("delta"),
-                        gamma=payload.get("gamma"),
-                        theta=payload.get("theta"),
-                        vega=payload.get("vega"),
-                        last_traded_price=payload.get("last_price"),
-                    )
+            ordered = sorted(bucket, key=lambda item: item["strike"])
+            payloads = summary_by_name
+            if payloads is None:
+                summaries = self._get_book_summaries([instrument["instrument_name"] for instrument in ordered])
+                payloads = {name: summary[0] for name, summary in summaries.items() if summary}
+            rows = [payloads.get(instrument["instrument_name"], {}) for instrument in ordered]
+            # Built in one comprehension so the list is sized once rather than
+            # grown append by append; the factory is bound to a local first.
+            contract_factory = self._contract_factory
+            contracts: List[OptionsContractData] = [
+                contract_factory(
+                    strike_price=instrument["strike"],
+                    contract_type=instrument["option_type"],
+                    implied_volatility=payload.get("mark_iv"),
+                    volume=payload.get("volume"),
+                    open_interest=payload.get("open_interest"),
+                    delta=payload.get("delta"),
+                    gamma=payload.get("gamma"),
+                    theta=payload.get("theta"),
+                    vega=payload.get("vega"),
+                    last_traded_price=payload.get("last_price"),
                 )
+                for instrument, payload in zip(ordered, rows)
+            ]
+            spot_price: Optional[float] = next(
+                (payload["underlying_price"] for payload in reversed(rows) if payload.get("underlying_price")), None
+            )
             if not spot_price:
                 spot_price = bucket[0].get("underlying_index_price") or 0.0
-            chain = OptionsChainData(
+            chain = self._chain_factory(
                 underlying_symbol=currency,
                 spot_price=spot_price or 0.0,
                 expiry_date=requested_expiry,
                 contracts=contracts,
+                contract_expiry=datetime.fromtimestamp(bucket[0]["expiration_timestamp"] / 1000, tz=UTC),
             )
             result.append(chain)
 
@@ -175,40 +327,34 @@ class DeribitMarketDataClient:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def normalize_expiry(self, expiry: str, *, now: Optional[datetime] = None) -> datetime:
+        """Resolve an ISO date or a ``7D``/``2W``/``1M``/``1Y`` tenor to a UTC datetime."""
+        expiry_dt: Optional[datetime] = None
+        if isinstance(expiry, str):
+            trimmed = expiry.strip()
+            if trimmed.endswith(("D", "W", "M", "Y")) and trimmed[:-1].isdigit():
+                now = now or datetime.now(UTC)
+                amount = int(trimmed[:-1])
+                unit = trimmed[-1].upper()
+                if unit == "D":
+                    expiry_dt = now + timedelta(days=amount)
+                elif unit == "W":
+                    expiry_dt = now + timedelta(weeks=amount)
+                elif unit == "M":
+                    expiry_dt = now + timedelta(days=30 * amount)
+                elif unit == "Y":
+                    expiry_dt = now + timedelta(days=365 * amount)
+            else:
+                expiry_dt = _parse_absolute_expiry(trimmed)
+        if expiry_dt is None:
+            raise ValueError(f"Unsupported expiry format: {expiry}")
+        if expiry_dt.tzinfo is None:
+            return expiry_dt.replace(tzinfo=UTC)
+        return expiry_dt.astimezone(UTC)
+
     def _normalize_expiries(self, expiries: Sequence[str]) -> List[datetime]:
-        normalized: List[datetime] = []
         now = datetime.now(UTC)
-        for expiry in expiries:
-            expiry_dt: Optional[datetime] = None
-            if isinstance(expiry, str):
-                trimmed = expiry.strip()
-                if trimmed.endswith(("D", "W", "M", "Y")) and trimmed[:-1].isdigit():
-                    amount = int(trimmed[:-1])
-                    unit = trimmed[-1].upper()
-                    if unit == "D":
-                        expiry_dt = now + timedelta(days=amount)
-                    elif unit == "W":
-                        expiry_dt = now + timedelta(weeks=amount)
-                    elif unit == "M":
-                        expiry_dt = now + timedelta(days=30 * amount)
-                    elif unit == "Y":
-                        expiry_dt = now + timedelta(days=365 * amount)
-                else:
-                    for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S%z"):
-                        try:
-                            expiry_dt = datetime.strptime(trimmed, fmt)
-                            break
-                        except ValueError:
-                            continue
-            if expiry_dt is None:
-                raise ValueError(f"Unsupported expiry format: {expiry}")
-            if expiry_dt.tzinfo is None:
-                expiry_dt = expiry_dt.replace(tzinfo=UTC)
-            else:
-                expiry_dt = expiry_dt.astimezone(UTC)
-            normalized.append(expiry_dt)
-        normalized.sort()
-        return normalized
+        return sorted(self.normalize_expiry(expiry, now=now) for expiry in expiries)
 
     def _group_instruments_by_expiry(self, instruments: Iterable[Dict[str, Any]]) -> Dict[datetime, List[Dict[str, Any]]]:
         grouped: Dict[datetime, List[Dict[str, Any]]] = {}
@@ -247,14 +393,43 @@ class DeribitMarketDataClient:
             raise DeribitAPIError("Unexpected response for get_book_summary_by_instrument")
         return result
 
+    def _get_book_summary_by_currency(self, *, currency: str, kind: str) -> List[Dict[str, Any]]:
+        params = {"currency": currency, "kind": kind}
+        result = self._request("public/get_book_summary_by_currency", params=params, method="GET")
+        if not isinstance(result, list):
+            raise DeribitAPIError("Unexpected response for get_book_summary_by_currency")
+        return result
+
+    def _get_instruments_and_summaries(
+        self, *, currency: str, kind: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch the instrument list and the bulk book summary in overlapping requests.
+
+        The two calls are independent, so a chain refresh costs one round trip
+        instead of two.
+        """
+        if self._max_workers == 1:
+            return (
+                self._get_instruments(currency=currency, kind=kind),
+                self._get_book_summary_by_currency(currency=currency, kind=kind),
+            )
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            summaries = executor.submit(self._get_book_summary_by_currency, currency=currency, kind=kind)
+            instruments = self._get_instruments(currency=currency, kind=kind)
+            return instruments, summaries.result()
+
+    def _get_book_summaries(self, instrument_names: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch book summaries concurrently, keyed by instrument name."""
+        if self._max_workers == 1 or len(instrument_names) <= 1:
+            return {name: self._get_book_summary(name) for name in instrument_names}
+        workers = min(self._max_workers, len(instrument_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self._get_book_summary, instrument_names)
+            return dict(zip(instrument_names, results))
+
     def _respect_rate_limit(self) -> None:
-        if not self._rate_limit_per_sec:
-            return
-        min_interval = 1.0 / self._rate_limit_per_sec
-        elapsed = time.time() - self._last_request_ts
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        self._last_request_ts = time.time()
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
 
     def _ensure_token(self) -> Optional[str]:
         if not self.client_id or not self.client_secret:
@@ -300,30 +475,30 @@ class DeribitMarketDataClient:
             request_kwargs["json"] = params
         response = self._session.request(method.upper(), url, **request_kwargs)
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         if "error" in data and data["error"]:
             raise DeribitAPIError(str(data["error"]))
         return data.get("result")
 
     def _to_serializable(self, chain: OptionsChainData) -> Dict[str, Any]:
-        if hasattr(chain, "model_dump"):
-            payload: Dict[str, Any] = chain.model_dump()
-        else:  # pragma: no cover - exercised under pydantic v1
-            payload = chain.dict()
+        payload: Dict[str, Any] = chain.model_dump()
         payload["expiry_date"] = chain.expiry_date.isoformat()
-        serialized_contracts = []
-        for contract in chain.contracts:
-            if hasattr(contract, "model_dump"):
-                contract_payload = contract.model_dump()
-            else:  # pragma: no cover - exercised under pydantic v1
-                contract_payload = contract.dict()
-            serialized_contracts.append(contract_payload)
-        payload["contracts"] = serialized_contracts
+        if chain.contract_expiry is not None:
+            payload["contract_expiry"] = chain.contract_expiry.isoformat()
         return payload
 
-    def _parse_options_chain(self, payload: Dict[str, Any]) -> OptionsChainData:
-        parser = getattr(OptionsChainData, "model_validate", OptionsChainData.parse_obj)
-        return parser(payload)
+    def _load_cached_chains(self, cache_key: str) -> Optional[List[OptionsChainData]]:
+        raw = self._cache.load_raw(cache_key)
+        if raw is None:
+            return None
+        try:
+            envelope = _CachedChains.model_validate_json(raw)
+        except ValidationError:
+            logger.warning("Discarding malformed Deribit cache entry")
+            return None
+        if not self._cache.is_fresh(envelope.stored_at):
+            return None
+        return envelope.payload
 
 
 __all__ = ["DeribitMarketDataClient", "DeribitAPIError"]
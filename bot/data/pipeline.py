@@ -1,13 +1,118 @@
 """High level interface for Deribit-backed market data fetching."""
 from __future__ import annotations
 
+import logging
 import os
+import time
 from dataclasses import dataclass, field
-from typing import List, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
 
 from agent_interfaces import OptionsChainData
 
-from .deribit_client import DeribitMarketDataClient
+from .deribit_client import DeribitMarketDataClient, OnDiskCache, _CachedChains
+
+logger = logging.getLogger(__name__)
+
+
+class ChainCache:
+    """Two-tier (memory + disk) cache of option chains keyed by ``(currency, expiry)``.
+
+    Chains whose contracts had already expired when they were stored cannot
+    change and are kept for ``historical_ttl`` seconds; everything else is a
+    live snapshot and goes stale after ``live_ttl``. A past-dated request the
+    client resolved to the nearest listed expiry is still live. Each
+    currency's directory is trimmed back to ``max_disk_bytes`` by evicting the
+    least recently used entries, once every ``prune_every`` writes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = Path(".cache") / "deribit" / "chains",
+        *,
+        live_ttl: float = 30.0,
+        historical_ttl: float = 90 * 24 * 3600.0,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        prune_every: int = 32,
+    ) -> None:
+        self.live_ttl = live_ttl
+        self.historical_ttl = historical_ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.prune_every = prune_every
+        self._writes_since_prune = 0
+        self._cache_dir = cache_dir
+        self._mem: Dict[Tuple[str, str], Tuple[float, OptionsChainData]] = {}
+        self._disk: Dict[str, OnDiskCache] = {}
+
+    def _ttl(self, chain: OptionsChainData, stored_at: float) -> float:
+        expiry = chain.contract_expiry or chain.expiry_date
+        return self.historical_ttl if expiry.timestamp() <= stored_at else self.live_ttl
+
+    def _disk_for(self, currency: str) -> Optional[OnDiskCache]:
+        if self._cache_dir is None:
+            return None
+        disk = self._disk.get(currency)
+        if disk is None:
+            disk = self._disk[currency] = OnDiskCache(self._cache_dir / currency, int(self.historical_ttl))
+        return disk
+
+    def _load(self, currency: str, expiry: str) -> Optional[Tuple[float, OptionsChainData]]:
+        disk = self._disk_for(currency)
+        raw = disk.load_raw(expiry) if disk is not None else None
+        if raw is None:
+            return None
+        try:
+            envelope = _CachedChains.model_validate_json(raw)
+        except ValidationError:
+            logger.warning("Discarding malformed chain cache entry for %s %s", currency, expiry)
+            return None
+        if len(envelope.payload) != 1:
+            return None
+        disk.touch(expiry)
+        return envelope.stored_at, envelope.payload[0]
+
+    def get(self, currency: str, expiry: str, *, now: Optional[float] = None) -> Optional[OptionsChainData]:
+        """Return the cached chain, if still fresh at ``now`` (epoch seconds, default: the current time)."""
+        key = (currency, expiry)
+        entry = self._mem.get(key) or self._load(currency, expiry)
+        if entry is None:
+            return None
+        stored_at, chain = entry
+        now = time.time() if now is None else now
+        if now - stored_at > self._ttl(chain, stored_at):
+            self._mem.pop(key, None)
+            return None
+        self._mem[key] = entry
+        return chain
+
+    def put(self, currency: str, expiry: str, chain: OptionsChainData) -> None:
+        self._mem[(currency, expiry)] = (time.time(), chain)
+        disk = self._disk_for(currency)
+        if disk is not None:
+            disk.store(expiry, [chain.model_dump(mode="json")])
+            self._writes_since_prune += 1
+
+    def prune(self) -> None:
+        """Trim every currency's disk layer back under ``max_disk_bytes``."""
+        self._writes_since_prune = 0
+        for disk in self._disk.values():
+            disk.prune(self.max_disk_bytes)
+
+    def maybe_prune(self) -> None:
+        """Prune only once ``prune_every`` chains were written since the last trim.
+
+        Pruning lists and stats every cached file, so it is not worth doing
+        after each miss.
+        """
+        if self._writes_since_prune >= self.prune_every:
+            self.prune()
+
+    def invalidate(self, currency: str, expiries: Sequence[str]) -> None:
+        for expiry in expiries:
+            self._mem.pop((currency, expiry), None)
 
 
 @dataclass
@@ -16,9 +121,49 @@ class MarketDataPipeline:
 
     client: DeribitMarketDataClient = field(default_factory=DeribitMarketDataClient)
     currency: str = "BTC"
+    cache: Optional[ChainCache] = field(default_factory=ChainCache)
 
     def fetch_option_chains(self, expiries: Sequence[str], *, refresh: bool = False) -> List[OptionsChainData]:
-        return self.client.fetch_options_chain(expiries=expiries, currency=self.currency, refresh=refresh)
+        if self.cache is None:
+            return self.client.fetch_options_chain(expiries=expiries, currency=self.currency, refresh=refresh)
+        if refresh:
+            self.cache.invalidate(self.currency, expiries)
+
+        chains: Dict[str, OptionsChainData] = {}
+        misses: List[str] = []
+        # One clock read covers every lookup and tenor resolution in this call.
+        now = datetime.now(UTC)
+        now_ts = now.timestamp()
+        for expiry in dict.fromkeys(expiries):
+            chain = None if refresh else self.cache.get(self.currency, expiry, now=now_ts)
+            if chain is None:
+                misses.append(expiry)
+            else:
+                chains[expiry] = chain
+
+        if misses:
+            # Resolve tenors once so each fetched chain maps back to the
+            # expiry strings that asked for it.
+            requested: Dict[datetime, List[str]] = {}
+            for expiry in misses:
+                requested.setdefault(self.client.normalize_expiry(expiry, now=now), []).append(expiry)
+            # The chain cache decides freshness, so misses bypass the client's
+            # own response cache; otherwise a live chain could be served from
+            # it up to the client's cache_ttl past ``live_ttl``.
+            fetched = self.client.fetch_options_chain(
+                expiries=[expiry_dt.isoformat() for expiry_dt in requested],
+                currency=self.currency,
+                refresh=True,
+            )
+            for chain in fetched:
+                for expiry in requested.get(chain.expiry_date, ()):
+                    self.cache.put(self.currency, expiry, chain)
+                    chains[expiry] = chain
+            self.cache.maybe_prune()
+
+        result = [chains[expiry] for expiry in expiries if expiry in chains]
+        result.sort(key=lambda chain: chain.expiry_date)
+        return result
 
 
 def build_pipeline_from_env() -> MarketDataPipeline:
@@ -32,4 +177,4 @@ def build_pipeline_from_env() -> MarketDataPipeline:
     return MarketDataPipeline(client=client, currency=currency)
 
 
-__all__ = ["MarketDataPipeline", "build_pipeline_from_env"]
+__all__ = ["ChainCache", "MarketDataPipeline", "build_pipeline_from_env"]
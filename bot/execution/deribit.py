@@ -1,14 +1,63 @@
 """Order execution adapter for Deribit."""
 from __future__ import annotations
 
+import json
 import logging
+import threading
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised when aiohttp is not installed
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+_SESSION_LOCK = threading.Lock()
+_SHARED_SESSION: Optional[requests.Session] = None
+
+
+def _shared_session() -> requests.Session:
+    """Return the process-wide keep-alive session used for order placement."""
+    global _SHARED_SESSION
+    with _SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            session = requests.Session()
+            # Only retry failed connects: once an order request has been sent
+            # a retry could place it twice. Orders are POSTs, which urllib3
+            # never retries on a status code anyway, so status retries are off.
+            retries = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1)
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+            _SHARED_SESSION = session
+        return _SHARED_SESSION
+
 
 @dataclass
 class Order:
@@ -24,27 +73,87 @@ class DeribitExecutionClient:
 
     BASE_URL = "https://www.deribit.com/api/v2"
 
-    def __init__(self, token: Optional[str] = None) -> None:
-        self.session = requests.Session()
+    def __init__(self, token: Optional[str] = None, session: Optional[requests.Session] = None) -> None:
+        self.session = session or _shared_session()
         self.token = token
+        self._aio_session: Optional["aiohttp.ClientSession"] = None
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    @token.setter
+    def token(self, value: Optional[str]) -> None:
+        self._token = value
+        # Bodies are pre-encoded bytes, so the content type is always sent.
+        self._headers = {**_JSON_HEADERS, "Authorization": f"Bearer {value}"} if value else dict(_JSON_HEADERS)
 
     def _request(self, endpoint: str, params: Dict) -> Dict:
-        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
-        response = self.session.post(f"{self.BASE_URL}{endpoint}", json=params, headers=headers, timeout=10)
+        response = self.session.post(f"{self.BASE_URL}{endpoint}", data=_dumps(params), headers=self._headers, timeout=10)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
 
-    def place_order(self, order: Order) -> Dict:
+    def _get_aio_session(self) -> "aiohttp.ClientSession":
+        # aiohttp sessions are bound to the running loop, so each client owns
+        # one and creates it lazily from inside that loop.
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for asynchronous order placement")
+        if self._aio_session is None or self._aio_session.closed:
+            connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, enable_cleanup_closed=True)
+            self._aio_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+        return self._aio_session
+
+    async def _request_async(self, endpoint: str, params: Dict) -> Dict:
+        session = self._get_aio_session()
+        async with session.post(f"{self.BASE_URL}{endpoint}", data=_dumps(params), headers=self._headers) as response:
+            response.raise_for_status()
+            return _loads(await response.read())
+
+    @staticmethod
+    def _order_request(order: Order) -> Tuple[str, Dict]:
+        # Sizes and prices often come straight out of NumPy/pandas; orjson
+        # refuses NumPy scalars, so they are coerced to plain floats here.
         params = {
             "instrument_name": order.instrument_name,
-            "amount": order.amount,
+            "amount": float(order.amount),
             "type": order.order_type,
             "side": order.side,
         }
         if order.price is not None:
-            params["price"] = order.price
-        logger.info("Placing Deribit order: %s", params)
-        return self._request("/private/buy" if order.side == "buy" else "/private/sell", params)
+            params["price"] = float(order.price)
+        return ("/private/buy" if order.side == "buy" else "/private/sell"), params
+
+    @staticmethod
+    def _log_order(order: Order) -> None:
+        # Skip building the record entirely when INFO is filtered out.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Placing Deribit order instrument=%s side=%s amount=%s price=%s type=%s",
+                order.instrument_name,
+                order.side,
+                order.amount,
+                order.price,
+                order.order_type,
+            )
+
+    def place_order(self, order: Order) -> Dict:
+        endpoint, params = self._order_request(order)
+        self._log_order(order)
+        return self._request(endpoint, params)
+
+    async def place_order_async(self, order: Order) -> Dict:
+        """Place ``order`` without blocking the event loop (for Scheduler consumers)."""
+        endpoint, params = self._order_request(order)
+        self._log_order(order)
+        return await self._request_async(endpoint, params)
+
+    async def aclose(self) -> None:
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
 
 
 __all__ = ["DeribitExecutionClient", "Order"]
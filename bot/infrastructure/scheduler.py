@@ -3,9 +3,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from ..observability.metrics import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -15,32 +17,73 @@ Consumer = Callable[[Payload], Awaitable[None]]
 
 @dataclass
 class DataChannel:
-    """Typed channel that transports payloads between producers and consumers."""
+    """Typed channel that transports payloads between producers and consumers.
+
+    Payloads sit in an unbounded deque and a single ``asyncio.Event`` wakes the
+    consumer once per burst rather than once per item. The deepest backlog seen
+    is kept in ``high_water`` and, when a registry is attached, exported as the
+    ``channel.<name>.high_water`` gauge.
+    """
 
     name: str
-    queue: asyncio.Queue[Payload] = field(default_factory=lambda: asyncio.Queue(maxsize=100))
+    metrics: Optional[MetricsRegistry] = None
+    high_water: int = 0
+    _buffer: Deque[Payload] = field(default_factory=deque, init=False, repr=False)
+    _not_empty: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
 
     async def publish(self, payload: Payload) -> None:
         logger.debug("Publishing payload to channel %s", self.name)
-        await self.queue.put(payload)
+        self._buffer.append(payload)
+        if len(self._buffer) > self.high_water:
+            self.high_water = len(self._buffer)
+            if self.metrics is not None:
+                self.metrics.gauge(f"channel.{self.name}.high_water", self.high_water)
+        self._not_empty.set()
+
+    async def _wait_for_payload(self) -> None:
+        while not self._buffer:
+            self._not_empty.clear()
+            await self._not_empty.wait()
 
     async def subscribe(self) -> Payload:
-        payload = await self.queue.get()
-        self.queue.task_done()
-        return payload
+        await self._wait_for_payload()
+        return self._buffer.popleft()
+
+    async def subscribe_batch(self, max_n: int = 100) -> List[Payload]:
+        """Wait for at least one payload, then return up to ``max_n`` in publish order."""
+        await self._wait_for_payload()
+        buffer = self._buffer
+        return [buffer.popleft() for _ in range(min(max_n, len(buffer)))]
+
+    def requeue(self, payloads: Sequence[Payload]) -> None:
+        """Put payloads taken by ``subscribe_batch`` but never handled back at the head, in order."""
+        if payloads:
+            self._buffer.extendleft(reversed(payloads))
+            self._not_empty.set()
 
 
 class Scheduler:
-    """Simple asynchronous scheduler with per-channel instrumentation."""
+    """Simple asynchronous scheduler with per-channel instrumentation.
+
+    Every consumer of a channel receives each payload concurrently, with at
+    most ``max_inflight`` consumer calls running per channel. A payload is
+    fully handled before the next one is dispatched, so each consumer still
+    sees payloads in publish order.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, metrics: Optional[MetricsRegistry] = None, max_inflight: int = 32) -> None:
+        self.metrics = metrics
+        self.max_inflight = max(1, max_inflight)
         self.channels: Dict[str, DataChannel] = {}
         self.consumers: Dict[str, list[Consumer]] = defaultdict(list)
         self._tasks: list[asyncio.Task[Any]] = []
 
     def get_channel(self, name: str) -> DataChannel:
         if name not in self.channels:
-            self.channels[name] = DataChannel(name=name)
+            self.channels[name] = DataChannel(name=name, metrics=self.metrics)
         return self.channels[name]
 
     def register_consumer(self, channel: str, consumer: Consumer) -> None:
@@ -50,16 +93,30 @@ class Scheduler:
         logger.info("Scheduler starting with channels: %s", list(self.channels))
         for channel_name, consumers in self.consumers.items():
             channel = self.get_channel(channel_name)
-            self._tasks.append(asyncio.create_task(self._dispatch_loop(channel, consumers)))
+            self._tasks.append(asyncio.create_task(self._dispatch_loop(channel, tuple(consumers))))
 
-    async def _dispatch_loop(self, channel: DataChannel, consumers: list[Consumer]) -> None:
+    async def _dispatch_loop(self, channel: DataChannel, consumers: Tuple[Consumer, ...]) -> None:
+        limit = asyncio.Semaphore(self.max_inflight)
         while True:
-            payload = await channel.subscribe()
-            for consumer in consumers:
+            batch = await channel.subscribe_batch()
+            for index, payload in enumerate(batch):
                 try:
-                    await consumer(payload)
-                except Exception as exc:  # noqa: BLE001
-                    logger.exception("Consumer error on channel %s: %s", channel.name, exc)
+                    if len(consumers) == 1:
+                        await self._run_one(channel, consumers[0], payload, limit)
+                    else:
+                        await asyncio.gather(*(self._run_one(channel, consumer, payload, limit) for consumer in consumers))
+                except asyncio.CancelledError:
+                    # Stopped mid-batch: payloads not yet dispatched stay in the
+                    # channel, as they would have without batching.
+                    channel.requeue(batch[index + 1:])
+                    raise
+
+    async def _run_one(self, channel: DataChannel, consumer: Consumer, payload: Payload, limit: asyncio.Semaphore) -> None:
+        async with limit:
+            try:
+                await consumer(payload)
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Consumer error on channel %s: %s", channel.name, exc)
 
     async def stop(self) -> None:
         for task in self._tasks:
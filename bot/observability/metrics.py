@@ -2,30 +2,180 @@
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
+import math
+import threading
+import weakref
+from array import array
+from collections import defaultdict, deque
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from time import perf_counter
-from typing import Dict, Iterator
+from typing import Any, Deque, Dict, Iterator, List, Set
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Counters are striped across per-thread shards: every thread that calls
+# ``inc`` gets a flat ``array('d')`` of its own, indexed by the counter's
+# interned id. A shard has a single writer, so its unlocked ``+=`` can never
+# lose an increment, and totals are the sum over all shards. ``_shards[0]`` is
+# a base accumulator no thread writes to: when a thread exits, its shard is
+# folded into a copy of the base and the shard list is swapped in one
+# assignment, so a reader sees the exited thread's counts exactly once.
+
+
+class _ShardOwner:
+    """Thread-local sentinel, collected together with its thread's locals on exit."""
+
+    __slots__ = ("__weakref__",)
+
+
+class FixedHistogram:
+    """Log-bucketed latency histogram with bounded memory.
+
+    Bucket ``0`` holds samples up to ``MIN_VALUE`` seconds and bucket ``i``
+    holds samples up to ``MIN_VALUE * GROWTH**i``, so reported percentiles are
+    the bucket's upper edge and overstate the true value by at most 10%.
+    Buckets from different histograms can be merged with a single ``np.add``.
+    """
+
+    MIN_VALUE = 1e-6
+    GROWTH = 1.1
+    BUCKETS = 256
+    _INV_LOG_GROWTH = 1.0 / math.log(GROWTH)
+    UPPER_BOUNDS = MIN_VALUE * GROWTH ** np.arange(BUCKETS)
+
+    def __init__(self) -> None:
+        self.buckets = np.zeros(self.BUCKETS, dtype=np.uint64)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        index = 0
+        if value > self.MIN_VALUE:
+            index = min(math.ceil(math.log(value / self.MIN_VALUE) * self._INV_LOG_GROWTH), self.BUCKETS - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "FixedHistogram") -> None:
+        np.add(self.buckets, other.buckets, out=self.buckets)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = max(math.ceil(q / 100.0 * self.count), 1)
+        index = int(np.searchsorted(np.cumsum(self.buckets), rank))
+        return float(self.UPPER_BOUNDS[index])
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": float(self.count),
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
 
 @dataclass
 class MetricsRegistry:
-    counters: Dict[str, float]
-    gauges: Dict[str, float]
-    histograms: Dict[str, list[float]]
+    gauges: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    histograms: Dict[str, FixedHistogram] = field(default_factory=lambda: defaultdict(FixedHistogram))
+    _shards: List["array[float]"] = field(default_factory=lambda: [array("d")], repr=False)
+    _exited: Deque["array[float]"] = field(default_factory=deque, repr=False)
+    _local: threading.local = field(default_factory=threading.local, repr=False)
+    _counter_ids: Dict[str, int] = field(default_factory=dict, repr=False)
+    _register_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    # Names touched since the last snapshot; only these are recomputed. Each
+    # update marks its name *after* writing the value, and snapshot unmarks
+    # names *before* reading them, so a concurrent update is never lost.
+    _dirty_counters: Set[str] = field(default_factory=set, repr=False)
+    _dirty_gauges: Set[str] = field(default_factory=set, repr=False)
+    _dirty_timers: Set[str] = field(default_factory=set, repr=False)
+    _last: Dict[str, Dict[str, Any]] = field(
+        default_factory=lambda: {"counters": {}, "gauges": {}, "timers": {}}, repr=False
+    )
 
     @classmethod
     def create(cls) -> "MetricsRegistry":
-        return cls(defaultdict(float), defaultdict(float), defaultdict(list))
+        return cls()
+
+    @property
+    def counters(self) -> Dict[str, float]:
+        """Counter totals summed across shards."""
+        ids = dict(self._counter_ids)
+        # Copy each shard before summing: a live buffer export would make a
+        # concurrent registration fail to grow the array.
+        self._fold_exited_shards()
+        totals = np.zeros(len(ids))
+        for shard in self._shards:
+            totals += np.frombuffer(shard.tobytes(), dtype=np.float64, count=len(ids))
+        return {name: float(totals[index]) for name, index in ids.items()}
 
     def inc(self, name: str, value: float = 1.0) -> None:
-        self.counters[name] += value
+        index = self._counter_ids.get(name)
+        if index is None:
+            index = self._register_counter(name)
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._new_thread_shard()
+        shard[index] += value
+        self._dirty_counters.add(name)
+
+    def _new_thread_shard(self) -> "array[float]":
+        with self._register_lock:
+            self._fold_exited_locked()
+            # Sized under the lock, so it covers every id published so far and
+            # later registrations grow it along with the other shards.
+            shard = array("d", bytes(8 * len(self._counter_ids)))
+            self._shards = [*self._shards, shard]
+        owner = _ShardOwner()
+        # The finalizer may run inside another thread's locked section (e.g.
+        # from the garbage collector), so it only queues the shard; folding
+        # happens later under the lock.
+        weakref.finalize(owner, self._exited.append, shard)
+        self._local.owner = owner
+        self._local.shard = shard
+        return shard
+
+    def _fold_exited_shards(self) -> None:
+        if self._exited:
+            with self._register_lock:
+                self._fold_exited_locked()
+
+    def _fold_exited_locked(self) -> None:
+        """Fold shards of exited threads into the base accumulator; caller holds ``_register_lock``."""
+        retired = []
+        while self._exited:
+            retired.append(self._exited.popleft())
+        if not retired:
+            return
+        base, *live = self._shards
+        totals = np.frombuffer(base.tobytes(), dtype=np.float64).copy()
+        for shard in retired:
+            totals += np.frombuffer(shard.tobytes(), dtype=np.float64)
+        gone = {id(shard) for shard in retired}
+        self._shards = [array("d", totals.tobytes()), *(shard for shard in live if id(shard) not in gone)]
+
+    def _register_counter(self, name: str) -> int:
+        with self._register_lock:
+            index = self._counter_ids.get(name)
+            if index is None:
+                index = len(self._counter_ids)
+                # Grow every shard before publishing the id, so no thread can
+                # see an index past the end of its shard.
+                for shard in self._shards:
+                    shard.append(0.0)
+                self._counter_ids[name] = index
+            return index
 
     def gauge(self, name: str, value: float) -> None:
         self.gauges[name] = value
+        self._dirty_gauges.add(name)
 
     @contextmanager
     def time(self, name: str) -> Iterator[None]:
@@ -34,12 +184,31 @@ class MetricsRegistry:
             yield
         finally:
             elapsed = perf_counter() - start
-            self.histograms[name].append(elapsed)
+            self.histograms[name].record(elapsed)
+            self._dirty_timers.add(name)
             logger.debug("Metric %s recorded %.4fs", name, elapsed)
 
-    def snapshot(self) -> Dict[str, Dict[str, float]]:
-        hist = {k: sum(v) / len(v) if v else 0.0 for k, v in self.histograms.items()}
-        return {"counters": dict(self.counters), "gauges": dict(self.gauges), "timers": hist}
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current metric values, recomputing only metrics updated since the last call."""
+        self._fold_exited_shards()
+        counters = self._last["counters"]
+        shards = self._shards
+        for name in self._take_dirty(self._dirty_counters):
+            index = self._counter_ids[name]
+            counters[name] = sum(shard[index] for shard in shards)
+        gauges = self._last["gauges"]
+        for name in self._take_dirty(self._dirty_gauges):
+            gauges[name] = self.gauges[name]
+        timers = self._last["timers"]
+        for name in self._take_dirty(self._dirty_timers):
+            timers[name] = self.histograms[name].summary()
+        return {"counters": dict(counters), "gauges": dict(gauges), "timers": dict(timers)}
+
+    @staticmethod
+    def _take_dirty(dirty: Set[str]) -> tuple[str, ...]:
+        names = tuple(dirty)
+        dirty.difference_update(names)
+        return names
 
 
-__all__ = ["MetricsRegistry"]
+__all__ = ["MetricsRegistry", "FixedHistogram"]
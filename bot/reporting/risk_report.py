@@ -3,20 +3,30 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
 
+_UNDERSCORE_TO_SPACE = str.maketrans("_", " ")
+
+
+@lru_cache(maxsize=1024)
+def _metric_label(key: str) -> str:
+    return key.translate(_UNDERSCORE_TO_SPACE).title()
+
+
 @dataclass
 class RiskReport:
     generated_at: datetime
     metrics: Dict[str, float]
 
     def render_markdown(self) -> str:
-        lines = ["# Daily Risk Report", f"Generated at: {self.generated_at.isoformat()}", ""]
-        for key, value in self.metrics.items():
-            lines.append(f"- **{key.replace('_', ' ').title()}**: {value:.4f}")
-        return "\n".join(lines)
+        header = f"# Daily Risk Report\nGenerated at: {self.generated_at.isoformat()}\n"
+        # str.join materialises its argument anyway, so a list comprehension
+        # is cheaper here than a generator.
+        lines = [f"- **{_metric_label(key)}**: {value:.4f}" for key, value in self.metrics.items()]
+        return "\n".join([header, *lines])
 
     def save(self, path: Path) -> Path:
         path.write_text(self.render_markdown())
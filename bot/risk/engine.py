@@ -1,8 +1,10 @@
 """Portfolio risk management utilities."""
 from __future__ import annotations
 
+from bisect import bisect_left, insort
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict
+from typing import Deque, Dict, List
 
 import numpy as np
 
@@ -16,10 +18,12 @@ class RiskConfig:
 
 def kelly_position_size(edge: float, win_prob: float, capital: float) -> float:
     """Compute the Kelly fraction for position sizing."""
-    if win_prob in {0, 1}:
+    if edge <= 0.0 or not 0.0 < win_prob < 1.0:
         return 0.0
-    b = edge / (1 - win_prob)
-    fraction = (win_prob * (b + 1) - 1) / b if b != 0 else 0.0
+    # With odds b = edge / (1 - p), the Kelly fraction (p * (b + 1) - 1) / b
+    # reduces to p - (1 - p)**2 / edge, which needs a single division.
+    loss_prob = 1.0 - win_prob
+    fraction = win_prob - loss_prob * loss_prob / edge
     return max(0.0, min(fraction, 1.0)) * capital
 
 
@@ -27,12 +31,49 @@ def conditional_var(returns: np.ndarray, confidence_level: float = 0.95) -> floa
     """Calculate conditional value at risk (CVaR)."""
     if returns.size == 0:
         return 0.0
-    sorted_returns = np.sort(returns)
-    index = int((1 - confidence_level) * len(sorted_returns))
-    tail = sorted_returns[: max(index, 1)]
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    count = min(max(int((1 - confidence_level) * returns.size), 1), returns.size)
+    # Only the tail is averaged, so an O(N) partition replaces a full sort.
+    tail = np.partition(returns, count - 1)[:count]
     return float(tail.mean())
 
 
+class RollingCVaR:
+    """CVaR over a sliding window of returns, updated one return at a time.
+
+    The window is kept both in arrival order and sorted, so each update is a
+    binary-search insert/remove and a query only averages the tail instead of
+    re-sorting the whole window.
+    """
+
+    def __init__(self, window: int, confidence_level: float = 0.95) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.confidence_level = confidence_level
+        self._arrivals: Deque[float] = deque()
+        self._sorted: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._arrivals)
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        if len(self._arrivals) == self.window:
+            expired = self._arrivals.popleft()
+            del self._sorted[bisect_left(self._sorted, expired)]
+        self._arrivals.append(value)
+        insort(self._sorted, value)
+
+    def value(self) -> float:
+        """Same result as :func:`conditional_var` on the current window."""
+        size = len(self._sorted)
+        if size == 0:
+            return 0.0
+        count = min(max(int((1 - self.confidence_level) * size), 1), size)
+        return float(np.mean(self._sorted[:count]))
+
+
 def compute_risk_budget(signal_strength: float, config: RiskConfig) -> Dict[str, float]:
     """Determine position sizing and expected loss budget."""
     edge = max(signal_strength, 0)
@@ -44,4 +85,26 @@ def compute_risk_budget(signal_strength: float, config: RiskConfig) -> Dict[str,
     }
 
 
-__all__ = ["RiskConfig", "kelly_position_size", "conditional_var", "compute_risk_budget"]
+def compute_risk_budget_vec(signal_strengths: np.ndarray, config: RiskConfig) -> Dict[str, np.ndarray]:
+    """Array version of :func:`compute_risk_budget` for a whole book of signals."""
+    edges = np.maximum(np.asarray(signal_strengths, dtype=np.float64), 0.0)
+    win_prob = 0.5 + edges * 0.5
+    loss_prob = 1.0 - win_prob
+    valid = (edges > 0.0) & (win_prob < 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = win_prob - loss_prob * loss_prob / edges
+    allocation = np.where(valid, np.clip(fraction, 0.0, 1.0), 0.0) * config.capital
+    return {
+        "allocation": allocation,
+        "max_loss": allocation * config.max_drawdown,
+    }
+
+
+__all__ = [
+    "RiskConfig",
+    "RollingCVaR",
+    "kelly_position_size",
+    "conditional_var",
+    "compute_risk_budget",
+    "compute_risk_budget_vec",
+]
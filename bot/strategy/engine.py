@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Protocol
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
 
 import numpy as np
 
@@ -30,6 +30,8 @@ class StrategyEngine:
 
     providers: Dict[str, FeatureProvider]
     config: StrategyConfig = field(default_factory=StrategyConfig)
+    _weight_names: Tuple[str, ...] = field(default=(), init=False, repr=False)
+    _weight_vec: Optional[np.ndarray] = field(default=None, init=False, repr=False)
 
     def generate_signal(self) -> Dict[str, float]:
         logger.debug("Generating signal using providers: %s", list(self.providers))
@@ -40,25 +42,52 @@ class StrategyEngine:
             except Exception as exc:  # noqa: BLE001
                 logger.exception("Feature provider %s failed: %s", name, exc)
                 features[name] = {}
-        combined = self._combine_features(features)
-        scored = self._score_combined_features(combined)
+        keys, values = self._combine_feature_vector(features)
+        combined = dict(zip(keys, values.tolist()))
+        scored = self._score_combined_features(values)
         return {"signal": scored, "features": combined}
 
+    def invalidate_weights(self) -> None:
+        """Drop the cached weight vector; call after mutating ``config.ensemble_weights``."""
+        self._weight_vec = None
+
+    def _weights_for(self, names: Tuple[str, ...]) -> np.ndarray:
+        # Rebuilt only when the provider set changes or after
+        # ``invalidate_weights()``, so steady-state ticks skip the lookups.
+        if self._weight_vec is None or names != self._weight_names:
+            weights = self.config.ensemble_weights
+            self._weight_vec = np.fromiter((weights.get(name, 1.0) for name in names), dtype=float, count=len(names))
+            self._weight_names = names
+        return self._weight_vec
+
     def _combine_features(self, features: Dict[str, Dict[str, float]]) -> Dict[str, float]:
-        weights = self.config.ensemble_weights or {name: 1.0 for name in features}
-        aggregated: Dict[str, float] = {}
-        for name, feature_set in features.items():
-            weight = weights.get(name, 1.0)
-            for key, value in feature_set.items():
-                aggregated[key] = aggregated.get(key, 0.0) + weight * value
-        return aggregated
-
-    def _score_combined_features(self, combined: Dict[str, float]) -> float:
-        values = np.array(list(combined.values()), dtype=float)
+        keys, aggregated = self._combine_feature_vector(features)
+        return dict(zip(keys, aggregated.tolist()))
+
+    def _combine_feature_vector(self, features: Dict[str, Dict[str, float]]) -> Tuple[List[str], np.ndarray]:
+        """Weighted sum of provider features as ``(keys, values)``.
+
+        Provider outputs are laid out as rows of a dense matrix over the union
+        of this call's feature keys, so the weighting is a single
+        ``weights @ matrix``. The index is rebuilt every call: feature keys
+        can be date-labelled, and a persistent index would only ever grow.
+        """
+        index: Dict[str, int] = {}
+        for feature_set in features.values():
+            for key in feature_set:
+                index.setdefault(key, len(index))
+        matrix = np.zeros((len(features), len(index)))
+        for row, feature_set in enumerate(features.values()):
+            if feature_set:
+                columns = np.fromiter((index[key] for key in feature_set), dtype=np.intp, count=len(feature_set))
+                matrix[row, columns] = np.fromiter(feature_set.values(), dtype=float, count=len(feature_set))
+        return list(index), self._weights_for(tuple(features)) @ matrix
+
+    def _score_combined_features(self, values: np.ndarray) -> float:
+        """Score the combined feature vector; ``values`` is overwritten in place."""
         if values.size == 0:
             return 0.0
-        normalized = np.tanh(values)
-        score = float(normalized.mean())
+        score = float(np.tanh(values, out=values).mean())
         adjusted = score * (1.0 - self.config.risk_aversion)
         if abs(adjusted) < self.config.min_signal_strength:
             return 0.0
@@ -1,6 +1,8 @@
 """BTC options data ingestion utilities backed by Deribit."""
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from typing import List, Sequence
 
 from agent_interfaces import OptionsChainData
@@ -16,11 +18,36 @@ def _parse_api_key(api_key: str | None) -> tuple[str | None, str | None]:
     return api_key, None
 
 
+_MAX_CLIENTS = 8
+_CLIENTS: "OrderedDict[str | None, DeribitMarketDataClient]" = OrderedDict()
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _client_for(client_id: str | None, client_secret: str | None) -> DeribitMarketDataClient:
+    # One client per client_id keeps its pooled keep-alive session, token and
+    # rate limiter alive across polling cycles. A rotated secret replaces the
+    # client, and clients pushed out of the cache have their sessions closed.
+    stale: List[DeribitMarketDataClient] = []
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(client_id)
+        if client is not None and client_secret is not None and client.client_secret != client_secret:
+            stale.append(_CLIENTS.pop(client_id))
+            client = None
+        if client is None:
+            client = _CLIENTS[client_id] = DeribitMarketDataClient(client_id=client_id, client_secret=client_secret)
+        _CLIENTS.move_to_end(client_id)
+        while len(_CLIENTS) > _MAX_CLIENTS:
+            stale.append(_CLIENTS.popitem(last=False)[1])
+    for evicted in stale:
+        evicted.close()
+    return client
+
+
 def fetch_btc_options_data(api_key: str | None, symbol: str, expiries: Sequence[str]) -> List[OptionsChainData]:
     """Fetch BTC options data from Deribit and map it into pydantic models."""
 
     client_id, client_secret = _parse_api_key(api_key)
-    client = DeribitMarketDataClient(client_id=client_id, client_secret=client_secret)
+    client = _client_for(client_id, client_secret)
     return client.fetch_options_chain(expiries=expiries, currency=symbol)
 
 
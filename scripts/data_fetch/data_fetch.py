@@ -1,21 +1,34 @@
-from scripts.data_fetch.fetch_historical_data import fetch_and_save_data
+from scripts.data_fetch.fetch_historical_data import fetch_history, history_data_path, is_history_fresh
 import os
+import numpy as np
 import pandas as pd
 import sqlite3
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Union
 
 # Import the MarketData interface
-from agent_interfaces import MarketData, OptionsChainData
+from agent_interfaces import MarketData, MarketDataFrame, OptionsChainData
 # Import utility functions
 from utils import get_data_directory, get_db_connection, setup_logger
 import os
 # Import for fetching BTC options data
 from .btc_options_fetch import fetch_btc_options_data
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover - exercised when pyarrow is not installed
+    pa = None
+    pacsv = None
+
+_CSV_ENGINE = "pyarrow" if pa is not None else "c"
+
 # Set up logging
 logger = setup_logger("data_fetch", os.path.join("logs", "data_fetch.log"))
 
+# Columns consumed downstream, with their dtypes so the reader skips inference.
+_OHLCV_DTYPES = {"Open": "float64", "High": "float64", "Low": "float64", "Close": "float64", "Volume": "float64"}
+
 # Use the utility function instead
 # def get_data_directory():
 #     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -53,56 +66,93 @@ def fetch_market_data(days=365, symbol="CL=F") -> Optional[pd.DataFrame]:
     else:
         period = "max"
     
-    data_path = os.path.join(get_data_directory(), "historical_data.csv")
-    
-    # Fetch data using the robust implementation
-    success = fetch_and_save_data(
-        symbol=symbol,
-        period=period,
-        interval="1h",
-        data_path=data_path
-    )
+    interval = "1h"
+    data_path = history_data_path(symbol, period, interval)
     
-    if not success:
-        logger.error("Failed to fetch market data")
-        return None
-        
-    # Load and return the data
     try:
-        df = pd.read_csv(data_path, parse_dates=["Date"])
+        if not is_history_fresh(data_path, interval):
+            # Fetch data using the robust implementation and hand the frame over
+            # directly; the CSV it writes only serves later runs as a cache
+            df = fetch_history(
+                symbol=symbol,
+                period=period,
+                interval=interval,
+                data_path=data_path
+            )
+            df = df[["Date", *_OHLCV_DTYPES]].astype(_OHLCV_DTYPES)
+            df["Date"] = pd.to_datetime(df["Date"], utc=True)
+        else:
+            df = read_market_csv(data_path)
         logger.info(f"Successfully loaded {len(df)} records of market data")
         return df
     except Exception as e:
         logger.error(f"Error loading fetched data: {e}")
         return None
 
-def convert_to_market_data(df: pd.DataFrame) -> List[MarketData]:
+def read_market_csv(path: str) -> pd.DataFrame:
+    """
+    Read an OHLCV CSV written by fetch_history
+
+    Only the Date and OHLCV columns are loaded, with fixed dtypes, using the
+    multithreaded pyarrow CSV reader when pyarrow is installed. Dates are
+    converted to UTC, since yfinance writes local exchange times whose offset
+    changes across DST.
+
+    Args:
+        path (str): Path to the CSV file
+
+    Returns:
+        pd.DataFrame: DataFrame with a UTC Date column and float OHLCV columns
+    """
+    df = pd.read_csv(
+        path,
+        engine=_CSV_ENGINE,
+        usecols=["Date", *_OHLCV_DTYPES],
+        dtype=_OHLCV_DTYPES,
+    )
+    df["Date"] = pd.to_datetime(df["Date"], utc=True, format="ISO8601")
+    return df
+
+def convert_to_market_data(df: pd.DataFrame) -> MarketDataFrame:
     """
-    Convert a DataFrame to a list of MarketData objects
+    Convert a DataFrame to a columnar batch of MarketData bars
     
     Args:
         df (pd.DataFrame): DataFrame with market data
         
     Returns:
-        List[MarketData]: List of MarketData objects
+        MarketDataFrame: Column arrays of the valid rows; indexing or iterating
+            it yields MarketData objects
     """
-    market_data_list = []
-    for _, row in df.iterrows():
-        try:
-            market_data = MarketData(
-                date=row["Date"],
-                open=float(row["Open"]),
-                high=float(row["High"]),
-                low=float(row["Low"]),
-                close=float(row["Close"]),
-                volume=int(row["Volume"])
-            )
-            market_data_list.append(market_data)
-        except Exception as e:
-            logger.warning(f"Error converting row to MarketData: {e}")
-    
-    logger.info(f"Converted {len(market_data_list)} records to MarketData objects")
-    return market_data_list
+    required = ["Date", "Open", "High", "Low", "Close", "Volume"]
+    missing = [column for column in required if column not in df.columns]
+    if missing:
+        logger.warning(f"Cannot convert to MarketData, missing columns: {missing}")
+        return MarketDataFrame([], [], [], [], [], [])
+
+    # Coerce and validate whole columns once instead of boxing a Series per row.
+    dates = df["Date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors="coerce")
+    prices = {column: pd.to_numeric(df[column], errors="coerce") for column in required[1:]}
+    valid = dates.notna().to_numpy(copy=True)
+    for values in prices.values():
+        valid &= np.isfinite(values.to_numpy(dtype=float))
+    dropped = int(len(df) - valid.sum())
+    if dropped:
+        logger.warning(f"Skipping {dropped} rows with missing or non-numeric OHLCV values")
+
+    market_data = MarketDataFrame(
+        date=dates[valid].to_numpy(),
+        open=prices["Open"][valid].to_numpy(dtype=float),
+        high=prices["High"][valid].to_numpy(dtype=float),
+        low=prices["Low"][valid].to_numpy(dtype=float),
+        close=prices["Close"][valid].to_numpy(dtype=float),
+        volume=prices["Volume"][valid].to_numpy(dtype=float).astype("int64")
+    )
+
+    logger.info(f"Converted {len(market_data)} records to MarketData columns")
+    return market_data
 
 def save_data_to_csv(df: pd.DataFrame, filename: str = "crude_oil_data.csv") -> bool:
     """
@@ -118,13 +168,54 @@ def save_data_to_csv(df: pd.DataFrame, filename: str = "crude_oil_data.csv") ->
     data_dir = get_data_directory()
     filepath = os.path.join(data_dir, filename)
     try:
-        df.to_csv(filepath, index=False)
+        if pacsv is not None:
+            # Arrow formats numbers and timestamps in C rather than row by row.
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filepath)
+        else:
+            # One large buffer so the writer issues few write() syscalls
+            with open(filepath, "w", buffering=1 << 20, newline="") as f:
+                df.to_csv(f, index=False)
         logger.info(f"Data saved to CSV at {filepath}")
         return True
     except Exception as e:
         logger.error(f"Error saving data to CSV: {e}")
         return False
 
+def save_data_to_parquet(df: pd.DataFrame, filename: str = "crude_oil_data.parquet") -> bool:
+    """
+    Save DataFrame to a zstd-compressed Parquet file
+
+    Parquet keeps column dtypes, so reloading skips CSV parsing and inference.
+
+    Args:
+        df (pd.DataFrame): DataFrame to save
+        filename (str): Name of the Parquet file
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if pa is None:
+        logger.error("pyarrow is required to save Parquet files")
+        return False
+    filepath = os.path.join(get_data_directory(), filename)
+    try:
+        df.to_parquet(filepath, engine="pyarrow", compression="zstd", index=False)
+        logger.info(f"Data saved to Parquet at {filepath}")
+        return True
+    except Exception as e:
+        logger.error(f"Error saving data to Parquet: {e}")
+        return False
+
+_SQLITE_COLUMN_TYPES = {
+    "Date": "TEXT",
+    "Open": "REAL",
+    "High": "REAL",
+    "Low": "REAL",
+    "Close": "REAL",
+    "Volume": "INTEGER",
+    "Sentiment_Score": "REAL",
+}
+
 def save_data_to_sqlite(df: pd.DataFrame, db_name: str = "market_data.db", table_name: str = "market_data") -> bool:
     """
     Save DataFrame to SQLite database
@@ -145,26 +236,63 @@ def save_data_to_sqlite(df: pd.DataFrame, db_name: str = "market_data.db", table
         if conn is None:
             return False
         
-        cursor = conn.cursor()
-        cursor.execute(f'''
-            CREATE TABLE IF NOT EXISTS {table_name} (
-                Date TEXT PRIMARY KEY,
-                Open REAL,
-                High REAL,
-                Low REAL,
-                Close REAL,
-                Volume INTEGER,
-                Sentiment_Score REAL DEFAULT NULL
-            )
-        ''')
-        df.to_sql(table_name, conn, if_exists="replace", index=False)
-        conn.close()
+        # Write every row in a single transaction; pandas' default executemany
+        # path is already batched for sqlite3. The database is shared with
+        # trade_history, so SQLite's durability defaults are kept.
+        column_types = {column: sql_type for column, sql_type in _SQLITE_COLUMN_TYPES.items() if column in df.columns}
+        try:
+            with conn:
+                df.to_sql(table_name, conn, if_exists="replace", index=False, chunksize=1000, dtype=column_types)
+        finally:
+            conn.close()
         logger.info(f"Data saved to SQLite database at {db_path} in table '{table_name}'")
         return True
     except Exception as e:
         logger.error(f"Error saving data to SQLite: {e}")
         return False
 
+def load_market_data_from_sqlite(db_name: str = "market_data.db", table_name: str = "market_data") -> List[MarketData]:
+    """
+    Load MarketData objects straight from a table written by save_data_to_sqlite
+
+    Rows are streamed from sqlite3 without building a DataFrame; the schema
+    is fixed by save_data_to_sqlite, so models are built without re-validation.
+
+    Args:
+        db_name (str): Name of the SQLite database
+        table_name (str): Name of the table
+
+    Returns:
+        List[MarketData]: List of MarketData objects (empty if the load failed)
+    """
+    db_path = os.path.join(get_data_directory(), db_name)
+    conn = get_db_connection(db_path)
+    if conn is None:
+        return []
+    construct = MarketData.model_construct
+    parse_date = datetime.fromisoformat
+    try:
+        cursor = conn.execute(f'SELECT Date, Open, High, Low, Close, Volume FROM "{table_name}"')
+        market_data_list = [
+            construct(
+                date=parse_date(date),
+                open=float(open_),
+                high=float(high),
+                low=float(low),
+                close=float(close),
+                volume=int(volume),
+            )
+            for date, open_, high, low, close, volume in cursor
+            if None not in (date, open_, high, low, close, volume)
+        ]
+    except Exception as e:
+        logger.error(f"Error loading market data from SQLite: {e}")
+        return []
+    finally:
+        conn.close()
+    logger.info(f"Loaded {len(market_data_list)} MarketData records from {db_path}")
+    return market_data_list
+
 def main():
     logger.info("WTI Crude Oil Trading Bot - Market Data Fetching")
     logger.info("==================================================")
@@ -174,15 +302,15 @@ def main():
         logger.error("Market data could not be fetched. Exiting.")
         return
     
-    # Convert to MarketData objects
-    market_data_list = convert_to_market_data(df)
+    # Convert to columnar MarketData
+    market_data = convert_to_market_data(df)
     
     # Save to CSV and SQLite
     save_data_to_csv(df)
     save_data_to_sqlite(df)
     
-    logger.info(f"Data fetching and storage complete! Fetched {len(market_data_list)} records.")
-    return market_data_list
+    logger.info(f"Data fetching and storage complete! Fetched {len(market_data)} records.")
+    return market_data
 
 if __name__ == "__main__":
     main()
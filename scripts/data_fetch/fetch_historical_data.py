@@ -6,95 +6,285 @@ It handles API calls, error handling, and data formatting.
 """
 
 import os
+import re
+import time
+import numpy as np
 import pandas as pd
 import yfinance as yf
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 
 # Import utility functions
 from utils import get_data_directory, setup_logger
 # Import retry utilities
 from utils.retry import retry, retry_with_result
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover - exercised when pyarrow is not installed
+    pa = None
+    pacsv = None
+
 # Set up logging
 logger = setup_logger("fetch_historical_data", os.path.join("logs", "fetch_historical_data.log"))
 
+# Seconds per yfinance interval unit ("5m", "1h", "1d", "1wk", "3mo", ...)
+_INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400, "wk": 7 * 86400, "mo": 30 * 86400}
+
+# yf.download accepts about this many symbols per request
+_DOWNLOAD_CHUNK = 20
+
+# (symbol, period, interval) -> (fetched_at, history frame)
+_history_cache: Dict[Tuple[str, str, str], Tuple[float, pd.DataFrame]] = {}
+
+def _interval_seconds(interval: str) -> int:
+    """
+    Length of one bar for a yfinance interval string, defaulting to one hour.
+    """
+    match = re.fullmatch(r"(\d+)(m|h|d|wk|mo)", interval)
+    if match is None:
+        return 3600
+    return int(match.group(1)) * _INTERVAL_UNITS[match.group(2)]
+
+def history_data_path(symbol: str, period: str, interval: str) -> str:
+    """
+    Default on-disk location for a fetch, keyed by its parameters.
+
+    Args:
+        symbol (str): Symbol the data was fetched for
+        period (str): Period the data covers
+        interval (str): Interval between data points
+
+    Returns:
+        str: Path of the CSV file inside the data directory
+    """
+    return os.path.join(get_data_directory(), f"{symbol}_{period}_{interval}.csv")
+
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    """
+    Write df to path as CSV, formatting it in C through pyarrow when available.
+    """
+    if pacsv is not None:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        # One large buffer so the writer issues few write() syscalls
+        with open(path, "w", buffering=1 << 20, newline="") as f:
+            df.to_csv(f, index=False)
+
+def _is_fresh(path: str, max_age: float) -> bool:
+    try:
+        return time.time() - os.path.getmtime(path) < max_age
+    except OSError:
+        return False
+
+@lru_cache(maxsize=128)
+def _get_ticker(symbol: str) -> yf.Ticker:
+    return yf.Ticker(symbol)
+
+def _get_history(symbol: str, period: str, interval: str) -> pd.DataFrame:
+    """
+    Fetch ticker history, reusing a result fetched less than one bar ago.
+
+    Returns a copy so callers can modify the frame without touching the cache.
+    """
+    key = (symbol, period, interval)
+    cached = _history_cache.get(key)
+    if cached is not None and time.time() - cached[0] < _interval_seconds(interval):
+        logger.info(f"Using cached history for {symbol} ({period}, {interval})")
+        return cached[1].copy()
+    df = _get_ticker(symbol).history(period=period, interval=interval)
+    if len(df) > 0:
+        _history_cache[key] = (time.time(), df)
+    return df.copy()
+
+def _normalize_history(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn a yfinance history frame into the Date/OHLCV layout written to disk.
+    """
+    # Reset index to make Date a column
+    df = df.reset_index()
+    
+    # Check if 'Datetime' or 'Date' is in the columns
+    date_col = 'Datetime' if 'Datetime' in df.columns else 'Date'
+    
+    # Rename columns to match expected format
+    column_mapping = {
+        date_col: "Date",
+        "Open": "Open",
+        "High": "High",
+        "Low": "Low",
+        "Close": "Close",
+        "Volume": "Volume"
+    }
+    df = df.rename(columns=column_mapping)
+    
+    # Ensure Date is in the correct format (ISO 8601 strings take the C parser)
+    df["Date"] = pd.to_datetime(df["Date"], format="ISO8601")
+    return df
+
+def is_history_fresh(data_path: str, interval: str) -> bool:
+    """
+    Check whether a saved history file is younger than one interval.
+    
+    A file written less than one bar ago cannot be missing a completed bar,
+    so it can be reused instead of fetching again.
+    
+    Args:
+        data_path (str): Path of the saved CSV file
+        interval (str): Interval between data points of the file
+        
+    Returns:
+        bool: True if the file exists and is fresh, False otherwise
+    """
+    return _is_fresh(data_path, _interval_seconds(interval))
+
 @retry(max_tries=3, delay=2.0, backoff=2.0, exceptions=[Exception], logger_name="fetch_historical_data")
-def fetch_and_save_data(
+def fetch_history(
     symbol: str = "CL=F",
     period: str = "1y",
     interval: str = "1h",
     data_path: Optional[str] = None
-) -> bool:
+) -> pd.DataFrame:
     """
-    Fetch historical market data from Yahoo Finance and save it to a CSV file.
+    Fetch historical market data from Yahoo Finance, save it to a CSV file and return it.
     This function is decorated with retry to handle transient network errors.
     
+    The returned DataFrame is the one that was fetched, so callers do not need
+    to read the CSV back; the file only serves later runs as a cache.
+    
     Args:
         symbol (str): Symbol to fetch data for (default: "CL=F" for WTI Crude Oil)
         period (str): Period to fetch data for (e.g., "1d", "1wk", "1mo", "1y", "max")
         interval (str): Interval between data points (e.g., "1m", "5m", "1h", "1d")
-        data_path (str, optional): Path to save the data to. If None, uses default path.
+        data_path (str, optional): Path to save the data to. If None, uses
+            history_data_path(symbol, period, interval).
         
     Returns:
-        bool: True if successful, False otherwise
+        pd.DataFrame: DataFrame with Date and OHLCV columns
         
     Raises:
         RetryError: If all retry attempts fail
     """
-    logger.info(f"Fetching historical data for {symbol} with period={period}, interval={interval}")
-    
     if data_path is None:
-        data_dir = get_data_directory()
-        data_path = os.path.join(data_dir, "historical_data.csv")
+        data_path = history_data_path(symbol, period, interval)
     
-    # Create ticker object
-    ticker = yf.Ticker(symbol)
-    
-    # Fetch historical data
-    df = ticker.history(period=period, interval=interval)
-    
-    # Reset index to make Date a column
-    df = df.reset_index()
-    
-    # Check if 'Datetime' or 'Date' is in the columns
-    date_col = 'Datetime' if 'Datetime' in df.columns else 'Date'
+    logger.info(f"Fetching historical data for {symbol} with period={period}, interval={interval}")
     
-    # Rename columns to match expected format
-    column_mapping = {
-        date_col: "Date",
-        "Open": "Open",
-        "High": "High",
-        "Low": "Low",
-        "Close": "Close",
-        "Volume": "Volume"
-    }
-    df = df.rename(columns=column_mapping)
+    # Fetch historical data (served from memory if fetched within the last bar)
+    df = _get_history(symbol, period, interval)
     
-    # Ensure Date is in the correct format
-    df["Date"] = pd.to_datetime(df["Date"])
+    df = _normalize_history(df)
     
     # Create mock data if the fetch failed
     if len(df) == 0:
         logger.warning("No data returned from Yahoo Finance. Creating mock data.")
         dates = pd.date_range(end=datetime.now(), periods=100, freq='1H')
+        drift = np.arange(100, dtype=np.float64) * 0.01
         mock_data = {
             'Date': dates,
-            'Open': [70.0 + i * 0.01 for i in range(100)],
-            'High': [71.0 + i * 0.01 for i in range(100)],
-            'Low': [69.0 + i * 0.01 for i in range(100)],
-            'Close': [70.5 + i * 0.01 for i in range(100)],
-            'Volume': [1000000 for _ in range(100)]
+            'Open': drift + 70.0,
+            'High': drift + 71.0,
+            'Low': drift + 69.0,
+            'Close': drift + 70.5,
+            'Volume': np.full(100, 1000000, dtype=np.int64)
         }
         df = pd.DataFrame(mock_data)
     
     # Save to CSV
-    df.to_csv(data_path, index=False)
+    _write_csv(df, data_path)
     
     logger.info(f"Successfully fetched and saved {len(df)} records to {data_path}")
+    return df
+
+def fetch_and_save_data(
+    symbol: str = "CL=F",
+    period: str = "1y",
+    interval: str = "1h",
+    data_path: Optional[str] = None
+) -> bool:
+    """
+    Fetch historical market data from Yahoo Finance and save it to a CSV file.
+    The fetch itself is retried by fetch_history to handle transient network errors.
+    
+    Args:
+        symbol (str): Symbol to fetch data for (default: "CL=F" for WTI Crude Oil)
+        period (str): Period to fetch data for (e.g., "1d", "1wk", "1mo", "1y", "max")
+        interval (str): Interval between data points (e.g., "1m", "5m", "1h", "1d")
+        data_path (str, optional): Path to save the data to. If None, uses a file in the
+            data directory named after symbol, period and interval. An existing file
+            younger than one interval is reused without fetching.
+        
+    Returns:
+        bool: True if successful, False otherwise
+        
+    Raises:
+        RetryError: If all retry attempts fail
+    """
+    if data_path is None:
+        data_path = history_data_path(symbol, period, interval)
+    
+    if is_history_fresh(data_path, interval):
+        logger.info(f"Using cached data for {symbol} from {data_path}")
+        return True
+    
+    fetch_history(symbol=symbol, period=period, interval=interval, data_path=data_path)
     return True
 
+def fetch_many(
+    symbols: List[str],
+    period: str = "1y",
+    interval: str = "1h"
+) -> Dict[str, str]:
+    """
+    Fetch several symbols with one yfinance request per 20 symbols.
+    
+    Each symbol is written to its own file at history_data_path(); symbols whose
+    file is younger than one interval are not requested again.
+    
+    Args:
+        symbols (List[str]): Symbols to fetch data for
+        period (str): Period to fetch data for (e.g., "1d", "1wk", "1mo", "1y", "max")
+        interval (str): Interval between data points (e.g., "1m", "5m", "1h", "1d")
+        
+    Returns:
+        Dict[str, str]: Path of the saved file for every symbol with data
+    """
+    max_age = _interval_seconds(interval)
+    paths = {symbol: history_data_path(symbol, period, interval) for symbol in dict.fromkeys(symbols)}
+    stale = [symbol for symbol, path in paths.items() if not _is_fresh(path, max_age)]
+    logger.info(f"Fetching {len(stale)} of {len(paths)} symbols with period={period}, interval={interval}")
+    
+    for start in range(0, len(stale), _DOWNLOAD_CHUNK):
+        chunk = stale[start:start + _DOWNLOAD_CHUNK]
+        batch = yf.download(
+            chunk,
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            threads=True,
+            progress=False
+        )
+        for symbol in chunk:
+            if isinstance(batch.columns, pd.MultiIndex):
+                if symbol not in batch.columns.get_level_values(0):
+                    continue
+                df = batch[symbol]
+            else:
+                df = batch
+            # Rows only exist for the union of every symbol's timestamps
+            df = df.dropna(how="all")
+            if len(df) == 0:
+                logger.warning(f"No data returned from Yahoo Finance for {symbol}")
+                continue
+            _write_csv(_normalize_history(df), paths[symbol])
+    
+    saved = {symbol: path for symbol, path in paths.items() if os.path.exists(path)}
+    logger.info(f"Saved data for {len(saved)} of {len(paths)} symbols")
+    return saved
+
 @retry_with_result(max_tries=3, delay=2.0, backoff=2.0, validator=lambda df: df is not None and len(df) > 0, logger_name="fetch_historical_data")
 def fetch_data_with_retry(
     symbol: str = "CL=F",
@@ -113,27 +303,21 @@ def fetch_data_with_retry(
     Returns:
         Optional[pd.DataFrame]: DataFrame with market data or None if fetch failed
     """
-    data_dir = get_data_directory()
-    data_path = os.path.join(data_dir, "historical_data.csv")
+    data_path = history_data_path(symbol, period, interval)
     
-    # Attempt to fetch and save data
-    success = fetch_and_save_data(
-        symbol=symbol,
-        period=period,
-        interval=interval,
-        data_path=data_path
-    )
-    
-    if success:
+    if is_history_fresh(data_path, interval):
         try:
-            df = pd.read_csv(data_path, parse_dates=["Date"])
-            if len(df) > 0:
-                logger.info(f"Successfully loaded {len(df)} records from {data_path}")
-                return df
-            else:
-                logger.warning("Loaded DataFrame is empty")
+            df = pd.read_csv(data_path, parse_dates=["Date"], date_format="ISO8601")
+            logger.info(f"Successfully loaded {len(df)} records from {data_path}")
         except Exception as e:
             logger.error(f"Error loading fetched data: {e}")
+            df = None
+    else:
+        # Use the fetched frame directly instead of reading the CSV back
+        df = fetch_history(symbol=symbol, period=period, interval=interval, data_path=data_path)
+    
+    if df is not None and len(df) > 0:
+        return df
     
     logger.error("Failed to fetch or load valid data")
     return None
@@ -1,16 +1,226 @@
 import os
 import sqlite3
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 import pandas as pd
 import numpy as np
 
 # Import utility functions
 from utils import get_data_directory, get_db_connection, setup_logger
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised when pyarrow is not installed
+    pa = None
+    pacsv = None
+    pq = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - exercised when numba is not installed
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
 # Configure logging using the utility function
 logger = setup_logger("indicators", os.path.join("logs", "indicators.log"))
 
+def _write_csv(df: pd.DataFrame, path: str) -> None:
+    """
+    Write df to path as CSV, formatting it in C through pyarrow when available.
+    """
+    if pacsv is not None:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+    else:
+        # One large buffer so the writer issues few write() syscalls
+        with open(path, "w", buffering=1 << 20, newline="") as f:
+            df.to_csv(f, index=False)
+
+# Columns added by calculate_indicators, in the order _compute_indicators returns them
+INDICATOR_COLUMNS = ("EMA_9", "EMA_21", "RSI", "MACD", "MACD_Signal", "MACD_Hist", "TR", "+DI", "-DI", "ADX")
+PERIOD = 14
+# Rows per chunk when streaming a price file through stream_indicators
+CHUNK_ROWS = 100_000
+
+def _new_indicator_state() -> np.ndarray:
+    """
+    Starting state for _indicator_pass: every smoothed mean NaN with weight 1,
+    every observation count 0, and no previous bar.
+    """
+    nan = np.nan
+    return np.array([
+        nan, 1.0, nan, 1.0, nan, 1.0, nan, 1.0, nan, 1.0,  # EMA 9/21/12/26, MACD signal
+        nan, 1.0, nan, 1.0, 0.0,                            # RSI gain, loss, count
+        nan, 1.0, nan, 1.0, 0.0,                            # +DM, -DM, count
+        nan, 1.0, 0.0, nan, 1.0, 0.0,                       # TR, count, ADX, count
+        nan, nan, nan,                                      # previous close, high, low
+    ])
+
+if NUMBA_AVAILABLE:
+
+    # Not fastmath: the NaN checks below must survive compilation, and
+    # error_model="numpy" makes x/0 give inf/NaN like pandas instead of raising.
+    @njit(cache=True, error_model="numpy")
+    def _ewm_step(mean: float, weight: float, value: float, alpha: float) -> Tuple[float, float]:
+        """
+        One pandas ewm(adjust=False) update, including its handling of NaN gaps.
+        """
+        if mean != mean:
+            return value, 1.0
+        weight *= 1.0 - alpha
+        if value != value:
+            return mean, weight
+        if mean != value:
+            mean = (weight * mean + alpha * value) / (weight + alpha)
+        return mean, 1.0
+
+    @njit(cache=True, error_model="numpy")
+    def _indicator_pass(close: np.ndarray, high: np.ndarray, low: np.ndarray, state: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Compute every indicator in one forward pass, matching the pandas fallback.
+        
+        state (see _new_indicator_state) is read at the start and updated in
+        place at the end, so consecutive chunks of one series can be passed in
+        turn and give the same values as a single call over the whole series.
+        """
+        n = close.shape[0]
+        nan = np.nan
+        ema9 = np.empty(n)
+        ema21 = np.empty(n)
+        rsi = np.empty(n)
+        macd = np.empty(n)
+        signal = np.empty(n)
+        hist = np.empty(n)
+        tr = np.empty(n)
+        plus_di = np.empty(n)
+        minus_di = np.empty(n)
+        adx = np.empty(n)
+        
+        a9, a21, a12, a26 = 2.0 / 10.0, 2.0 / 22.0, 2.0 / 13.0, 2.0 / 27.0
+        wilder = 1.0 / PERIOD
+        # (mean, weight) state of every smoothed series, plus Wilder observation counts
+        e9, w9, e21, w21, e12, w12, e26, w26, sig, wsig = state[0:10]
+        gain_s, wgain, loss_s, wloss, n_delta = state[10:15]
+        pdm_s, wpdm, mdm_s, wmdm, n_dm = state[15:20]
+        tr_s, wtr, n_tr, adx_s, wadx, n_dx = state[20:26]
+        # Previous bar, NaN before the first one
+        prev_close, prev_high, prev_low = state[26:29]
+        
+        for i in range(n):
+            c = close[i]
+            e9, w9 = _ewm_step(e9, w9, c, a9)
+            e21, w21 = _ewm_step(e21, w21, c, a21)
+            e12, w12 = _ewm_step(e12, w12, c, a12)
+            e26, w26 = _ewm_step(e26, w26, c, a26)
+            ema9[i] = e9
+            ema21[i] = e21
+            m = e12 - e26
+            sig, wsig = _ewm_step(sig, wsig, m, a9)
+            macd[i] = m
+            signal[i] = sig
+            hist[i] = m - sig
+            
+            delta = c - prev_close
+            up_move = high[i] - prev_high
+            down_move = prev_low - low[i]
+            
+            # RSI
+            if delta == delta:
+                n_delta += 1
+            gain_s, wgain = _ewm_step(gain_s, wgain, max(delta, 0.0) if delta == delta else nan, wilder)
+            loss_s, wloss = _ewm_step(loss_s, wloss, max(-delta, 0.0) if delta == delta else nan, wilder)
+            rsi[i] = 100.0 - 100.0 / (1.0 + gain_s / loss_s) if n_delta >= PERIOD else nan
+            
+            # ADX
+            hl = high[i] - low[i]
+            hc = abs(high[i] - prev_close)
+            lc = abs(low[i] - prev_close)
+            true_range = max(hl, hc, lc) if hl == hl and hc == hc and lc == lc else nan
+            tr[i] = true_range
+            if true_range == true_range:
+                n_tr += 1
+            plus_dm = up_move if up_move > down_move and up_move > 0.0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0.0 else 0.0
+            n_dm += 1
+            pdm_s, wpdm = _ewm_step(pdm_s, wpdm, plus_dm, wilder)
+            mdm_s, wmdm = _ewm_step(mdm_s, wmdm, minus_dm, wilder)
+            tr_s, wtr = _ewm_step(tr_s, wtr, true_range, wilder)
+            if n_dm >= PERIOD and n_tr >= PERIOD:
+                pdi = 100.0 * pdm_s / tr_s
+                mdi = 100.0 * mdm_s / tr_s
+            else:
+                pdi = mdi = nan
+            plus_di[i] = pdi
+            minus_di[i] = mdi
+            dx = 100.0 * (abs(pdi - mdi) / (pdi + mdi))
+            if dx == dx:
+                n_dx += 1
+            adx_s, wadx = _ewm_step(adx_s, wadx, dx, wilder)
+            adx[i] = adx_s if n_dx >= PERIOD else nan
+            
+            prev_close, prev_high, prev_low = c, high[i], low[i]
+        
+        updated = (
+            e9, w9, e21, w21, e12, w12, e26, w26, sig, wsig,
+            gain_s, wgain, loss_s, wloss, n_delta,
+            pdm_s, wpdm, mdm_s, wmdm, n_dm,
+            tr_s, wtr, n_tr, adx_s, wadx, n_dx,
+            prev_close, prev_high, prev_low,
+        )
+        for k in range(len(updated)):
+            state[k] = updated[k]
+        return ema9, ema21, rsi, macd, signal, hist, tr, plus_di, minus_di, adx
+
+    def _compute_indicators_numba(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, ...]:
+        return _indicator_pass(close, high, low, _new_indicator_state())
+
+def _compute_indicators_pandas(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, ...]:
+    close_s = pd.Series(close)
+    
+    def wilder(values) -> np.ndarray:
+        return pd.Series(values).ewm(alpha=1 / PERIOD, adjust=False, min_periods=PERIOD).mean().to_numpy()
+        
+    # EMA calculations using pandas ewm
+    ema_9 = close_s.ewm(span=9, adjust=False).mean()
+    ema_21 = close_s.ewm(span=21, adjust=False).mean()
+    
+    # RSI calculation with Wilder's smoothing (an EMA with alpha = 1/period)
+    delta = close_s.diff()
+    avg_gain = wilder(delta.clip(lower=0))
+    avg_loss = wilder(-delta.clip(upper=0))
+    
+    # MACD calculation
+    macd = close_s.ewm(span=12, adjust=False).mean() - close_s.ewm(span=26, adjust=False).mean()
+    macd_signal = macd.ewm(span=9, adjust=False).mean()
+    
+    # ADX calculation on plain arrays; +DI/-DI are ratios, so Wilder averages and sums agree
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    up_move = np.diff(high, prepend=np.nan)
+    down_move = -np.diff(low, prepend=np.nan)
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    tr_smooth = wilder(tr)
+    
+    # Flat stretches divide by zero; like pandas, leave inf/NaN without warning
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        plus_di = 100 * wilder(plus_dm) / tr_smooth
+        minus_di = 100 * wilder(minus_dm) / tr_smooth
+        dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
+    adx = wilder(dx)
+    
+    macd = macd.to_numpy()
+    macd_signal = macd_signal.to_numpy()
+    return ema_9.to_numpy(), ema_21.to_numpy(), rsi, macd, macd_signal, macd - macd_signal, tr, plus_di, minus_di, adx
+
+# One compiled pass when numba is installed; the pandas version is the reference
+_compute_indicators = _compute_indicators_numba if NUMBA_AVAILABLE else _compute_indicators_pandas
+
 def load_data(filepath: str) -> Optional[pd.DataFrame]:
     """
     Load price data from a CSV file using pandas.
@@ -22,7 +232,8 @@ def load_data(filepath: str) -> Optional[pd.DataFrame]:
         Optional[DataFrame]: Pandas DataFrame with the price data or None if loading failed.
     """
     try:
-        df = pd.read_csv(filepath, parse_dates=["Date"])
+        # Our files hold ISO 8601 dates; naming the format skips per-row inference
+        df = pd.read_csv(filepath, parse_dates=["Date"], date_format="ISO8601")
         logger.info(f"Loaded {len(df)} records from {filepath}")
         return df
     except Exception as e:
@@ -35,9 +246,12 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     
     Indicators calculated:
       - EMA (9 and 21)
-      - RSI (14)
+      - RSI (14) with Wilder's smoothing
       - MACD, MACD Signal, MACD Histogram
-      - ADX (14) using a simplified method
+      - ADX (14) with Wilder's smoothing
+    
+    With numba installed all indicators are computed in one compiled pass
+    over the price arrays; otherwise the same values come from pandas.
     
     Args:
         df (DataFrame): DataFrame containing at least 'Date', 'Open', 'High', 'Low', 'Close', 'Volume'.
@@ -45,68 +259,113 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame: Original DataFrame with added indicator columns.
     """
-    # Ensure the data is sorted by Date
-    df = df.sort_values("Date").reset_index(drop=True)
+    # Ensure the data is sorted by Date (our own CSVs already are, so check first)
+    if df["Date"].is_monotonic_increasing:
+        df = df.reset_index(drop=True)
+    else:
+        df = df.sort_values("Date").reset_index(drop=True)
     
+    df = _clean_prices(df)
+    return _attach_indicators(df, _compute_indicators(*_price_arrays(df)))
+
+def _clean_prices(df: pd.DataFrame) -> pd.DataFrame:
     # Convert columns to numeric, coerce errors to NaN
     numeric_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
     for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
     
     # Drop rows where 'Close' is NaN (or any key numeric field if desired)
-    df.dropna(subset=['Close'], inplace=True)
+    return df.dropna(subset=['Close'])
+
+def _price_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        df["Close"].to_numpy(dtype=np.float64),
+        df["High"].to_numpy(dtype=np.float64),
+        df["Low"].to_numpy(dtype=np.float64),
+    )
+
+def _attach_indicators(df: pd.DataFrame, columns: Tuple[np.ndarray, ...]) -> pd.DataFrame:
+    # Attach every indicator in one concat rather than one block insert per column
+    indicators = pd.DataFrame(dict(zip(INDICATOR_COLUMNS, columns)), index=df.index)
+    return pd.concat([df.drop(columns=list(INDICATOR_COLUMNS), errors="ignore"), indicators], axis=1)
+
+def stream_indicators(data_csv_path: str, db_path: str, output_path: str, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Calculate indicators for a price CSV chunk by chunk, bounding peak memory.
     
-    # EMA calculations using pandas ewm
-    df["EMA_9"] = df["Close"].ewm(span=9, adjust=False).mean()
-    df["EMA_21"] = df["Close"].ewm(span=21, adjust=False).mean()
-    
-    # RSI calculation
-    delta = df["Close"].diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    period = 14
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
-    rs = avg_gain / avg_loss
-    df["RSI"] = 100 - (100 / (1 + rs))
+    Each chunk is read, extended with indicators and appended to the SQLite
+    table and to output_path (Parquet when pyarrow is installed, CSV otherwise)
+    before the next one is read. The smoothing state is carried across chunk
+    boundaries, so the values equal those of calculate_indicators on the whole
+    file. Requires numba, and the CSV must already be sorted by Date.
     
-    # MACD calculation
-    ema_fast = df["Close"].ewm(span=12, adjust=False).mean()
-    ema_slow = df["Close"].ewm(span=26, adjust=False).mean()
-    df["MACD"] = ema_fast - ema_slow
-    df["MACD_Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
-    df["MACD_Hist"] = df["MACD"] - df["MACD_Signal"]
-    
-    # ADX calculation (simplified)
-    df["prev_Close"] = df["Close"].shift(1)
-    df["TR"] = np.maximum(df["High"] - df["Low"],
-                          np.maximum((df["High"] - df["prev_Close"]).abs(), (df["Low"] - df["prev_Close"]).abs()))
-    df["up_move"] = df["High"] - df["High"].shift(1)
-    df["down_move"] = df["Low"].shift(1) - df["Low"]
-    df["+DM"] = np.where((df["up_move"] > df["down_move"]) & (df["up_move"] > 0), df["up_move"], 0)
-    df["-DM"] = np.where((df["down_move"] > df["up_move"]) & (df["down_move"] > 0), df["down_move"], 0)
-    
-    period_adx = 14
-    df["+DM_Smooth"] = df["+DM"].rolling(window=period_adx, min_periods=period_adx).sum()
-    df["-DM_Smooth"] = df["-DM"].rolling(window=period_adx, min_periods=period_adx).sum()
-    df["TR_Sum"] = df["TR"].rolling(window=period_adx, min_periods=period_adx).sum()
-    df["+DI"] = 100 * df["+DM_Smooth"] / df["TR_Sum"]
-    df["-DI"] = 100 * df["-DM_Smooth"] / df["TR_Sum"]
-    df["DX"] = 100 * (abs(df["+DI"] - df["-DI"]) / (df["+DI"] + df["-DI"]))
-    df["ADX"] = df["DX"].rolling(window=period_adx, min_periods=period_adx).mean()
-    
-    # Clean up temporary columns
-    df.drop(columns=["prev_Close", "up_move", "down_move", "+DM", "-DM", "+DM_Smooth", "-DM_Smooth", "TR_Sum", "DX"], inplace=True)
-    
-    return df
-
-def save_indicators_to_db(df: pd.DataFrame, db_path: str) -> bool:
+    Args:
+        data_csv_path (str): Path to the price CSV file.
+        db_path (str): Path to the SQLite database.
+        output_path (str): Path of the Parquet or CSV file to write.
+        chunk_rows (int): Number of CSV rows read per chunk.
+        
+    Returns:
+        int: Number of rows written.
+        
+    Raises:
+        ValueError: If the CSV is not sorted by Date.
+        RuntimeError: If numba is not installed, or a chunk cannot be stored in SQLite.
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("numba is required to stream indicator calculation")
+    state = _new_indicator_state()
+    writer = None
+    rows = 0
+    chunks = 0
+    last_date = None
+    reader = pd.read_csv(data_csv_path, parse_dates=["Date"], date_format="ISO8601", chunksize=chunk_rows)
+    try:
+        for chunk in reader:
+            dates = chunk["Date"]
+            if not dates.is_monotonic_increasing or (last_date is not None and len(dates) and dates.iloc[0] < last_date):
+                raise ValueError(f"{data_csv_path} must be sorted by Date to stream indicators")
+            if len(dates):
+                last_date = dates.iloc[-1]
+            
+            df = _clean_prices(chunk)
+            df = _attach_indicators(df, _indicator_pass(*_price_arrays(df), state))
+            
+            if not save_indicators_to_db(df, db_path, append=chunks > 0):
+                raise RuntimeError(f"Failed to store indicators in {db_path}")
+            if pq is not None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema, compression="zstd")
+                writer.write_table(table.cast(writer.schema))
+            else:
+                if writer is None:
+                    writer = open(output_path, "w", buffering=1 << 20, newline="")
+                df.to_csv(writer, index=False, header=chunks == 0)
+            rows += len(df)
+            chunks += 1
+    finally:
+        if writer is not None:
+            writer.close()
+    logger.info(f"Streamed {rows} rows of indicators to {output_path} and {db_path}")
+    return rows
+
+def _sqlite_type(series: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    return "TEXT"
+
+def save_indicators_to_db(df: pd.DataFrame, db_path: str, append: bool = False) -> bool:
     """
     Store the DataFrame with indicators into an SQLite database.
     
     Args:
         df (DataFrame): DataFrame with computed indicators.
         db_path (str): Path to the SQLite database.
+        append (bool): Add the rows to the existing table instead of replacing it.
         
     Returns:
         bool: True if successful, False otherwise.
@@ -116,8 +375,29 @@ def save_indicators_to_db(df: pd.DataFrame, db_path: str) -> bool:
         if conn is None:
             return False
             
-        df.to_sql("market_data", conn, if_exists="replace", index=False)
-        conn.close()
+        # Insert every row with one executemany in a single transaction. The
+        # database also holds trade_history, so durability settings are left
+        # at SQLite's defaults rather than relaxed for this derived table.
+        names = [f'"{column}"' for column in df.columns]
+        schema = ", ".join(f"{name} {_sqlite_type(df[column])}" for name, column in zip(names, df.columns))
+        values = []
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                # Same text as to_sql stores: Timestamp.isoformat(" "), NULL for NaT
+                series = series.astype(str).where(series.notna(), None)
+            values.append(series.tolist())
+        try:
+            with conn:
+                if not append:
+                    conn.execute("DROP TABLE IF EXISTS market_data")
+                    conn.execute(f"CREATE TABLE market_data ({schema})")
+                conn.executemany(
+                    f"INSERT INTO market_data ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                    zip(*values),
+                )
+        finally:
+            conn.close()
         logger.info(f"Indicators stored in SQLite database at {db_path} in table 'market_data'")
         return True
     except Exception as e:
@@ -131,6 +411,23 @@ def main():
     data_csv_path = os.path.join(data_dir, "crude_oil_data.csv")
     db_path = os.path.join(data_dir, "market_data.db")
     
+    output_name = "crude_oil_with_indicators.parquet" if pq is not None else "crude_oil_with_indicators.csv"
+    output_path = os.path.join(data_dir, output_name)
+    
+    if NUMBA_AVAILABLE:
+        # Read, compute and write chunk by chunk so peak memory stays bounded;
+        # an unsorted file falls back to loading and sorting it whole below
+        try:
+            stream_indicators(data_csv_path, db_path, output_path)
+            logger.info("Indicator calculation complete! Data stored in SQLite.")
+            logger.info("Technical indicators calculation complete!")
+            return
+        except ValueError as e:
+            logger.warning(f"{e}; calculating on the whole file instead")
+        except Exception as e:
+            logger.error(f"Error streaming indicators: {e}")
+            return
+    
     df = load_data(data_csv_path)
     if df is None:
         logger.error("Failed to load price data. Please check the CSV file.")
@@ -139,13 +436,16 @@ def main():
     logger.info("Calculating technical indicators using pandas...")
     df_with_indicators = calculate_indicators(df)
     
-    # Optionally, save to CSV for verification
-    output_csv = os.path.join(data_dir, "crude_oil_with_indicators.csv")
+    # Save a file copy for downstream stages: zstd Parquet when pyarrow is
+    # installed (columnar, no per-cell formatting), CSV otherwise
     try:
-        df_with_indicators.to_csv(output_csv, index=False)
-        logger.info(f"Indicators saved to CSV at {output_csv}")
+        if pq is not None:
+            pq.write_table(pa.Table.from_pandas(df_with_indicators, preserve_index=False), output_path, compression="zstd")
+        else:
+            _write_csv(df_with_indicators, output_path)
+        logger.info(f"Indicators saved to {output_path}")
     except Exception as e:
-        logger.error(f"Error saving indicators to CSV: {e}")
+        logger.error(f"Error saving indicators file: {e}")
     
     # Save indicators directly to SQLite
     if save_indicators_to_db(df_with_indicators, db_path):
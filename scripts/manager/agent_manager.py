@@ -21,8 +21,10 @@ import time
 import logging
 import threading
 import queue
+import pandas as pd
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union, Callable
+from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 
 # Import agent interfaces
 from agent_interfaces import (
@@ -34,17 +36,66 @@ from agent_interfaces import (
 from utils import get_data_directory, get_db_connection, setup_logger
 
 # Import agents
-from scripts.data_fetch.data_fetch import fetch_market_data, convert_to_market_data
-# fetch_market_data will be kept for non-BTC, convert_to_market_data for OHLCV
+from scripts.data_fetch.data_fetch import fetch_market_data
+# fetch_market_data will be kept for non-BTC OHLCV
 from scripts.data_fetch.btc_options_fetch import fetch_btc_options_data # Added
 from scripts.volatility_analysis.smirk_analyzer import SmirkAnalyzer # Added
 from scripts.strategy.strategy import TradingStrategy # generate_signals_with_ml might be removed later
-from scripts.risk.trade_execution import InvestmentTracker, record_trade
+from scripts.risk.trade_execution import InvestmentTracker, record_trade_batch
 from scripts.indicators.indicators import calculate_indicators
 
+# Order type recorded for each actionable TradingSignal.signal value
+ORDER_TYPES = {1: "BUY", -1: "SELL"}
+
 # Set up logging
 logger = setup_logger("agent_manager", os.path.join("logs", "agent_manager.log"))
 
+class SPSCQueue:
+    """
+    Unbounded single-producer/single-consumer hand-off between agent stages.
+    
+    Each stage queue has exactly one producing method and one consuming method,
+    so no lock is needed: CPython's deque.append and deque.popleft are atomic,
+    the producer only appends and the consumer only pops.
+    """
+    __slots__ = ("_items",)
+    
+    def __init__(self):
+        self._items = deque()
+    
+    def put(self, item: Any) -> None:
+        self._items.append(item)
+    
+    def get_nowait(self) -> Any:
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise queue.Empty from None
+    
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        """
+        Remove and return queued items in FIFO order without blocking.
+        
+        Items put while draining are left for the next call.
+        
+        Args:
+            max_items (int, optional): Maximum number of items to remove. Defaults to all.
+            
+        Returns:
+            List[Any]: The removed items, possibly empty.
+        """
+        count = len(self._items)
+        if max_items is not None:
+            count = min(count, max(max_items, 0))
+        popleft = self._items.popleft
+        return [popleft() for _ in range(count)]
+    
+    def qsize(self) -> int:
+        return len(self._items)
+    
+    def empty(self) -> bool:
+        return not self._items
+
 class AgentManager:
     """
     Agent Manager class that coordinates all trading agents.
@@ -61,10 +112,15 @@ class AgentManager:
         self.db_path = os.path.join(self.data_dir, "market_data.db")
         
         # Initialize message queues for inter-agent communication
-        self.options_data_queue = queue.Queue() # Renamed from market_data_queue
-        self.volatility_analysis_queue = queue.Queue() # Renamed from sentiment_queue
-        self.signal_queue = queue.Queue()
-        self.trade_queue = queue.Queue()
+        self.options_data_queue = SPSCQueue() # Renamed from market_data_queue
+        self.volatility_analysis_queue = SPSCQueue() # Renamed from sentiment_queue
+        self.signal_queue = SPSCQueue()
+        self.trade_queue = SPSCQueue()
+        
+        # Latest OHLCV frame with indicators per non-options symbol
+        self.latest_market_data: Dict[str, pd.DataFrame] = {}
+        # Raw frame the indicators were last computed from, per symbol
+        self.indicator_cache: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
         
         # Initialize agents
         self.data_agent = None # This specific agent might be removed if fetching is done directly
@@ -117,7 +173,8 @@ class AgentManager:
     def fetch_data_for_symbol(self, symbol: str, days: int = 30) -> None:
         """
         Fetches appropriate data (OHLCV or Options) based on the symbol.
-        Puts MarketData (for OHLCV) or OptionsChainData into respective queues.
+        Puts OptionsChainData into the options queue; OHLCV data with indicators
+        is kept per symbol in latest_market_data.
         """
         logger.info(f"Fetching data for {symbol}...")
         if symbol.upper() == "BTC-USD": # Check against configured BTC symbol
@@ -151,25 +208,21 @@ class AgentManager:
                     logger.error(f"Failed to fetch market data for {symbol}")
                     return
                 
-                df_with_indicators = calculate_indicators(df) # Keep for non-BTC
-                market_data_list = convert_to_market_data(df_with_indicators)
+                # fetch_market_data serves an unchanged frame within the same bar;
+                # reuse its indicators instead of recomputing them every cycle
+                cached = self.indicator_cache.get(symbol)
+                if cached is not None and cached[0].equals(df):
+                    df_with_indicators = cached[1]
+                    logger.info(f"Market data for {symbol} unchanged, reusing indicators")
+                else:
+                    df_with_indicators = calculate_indicators(df) # Keep for non-BTC
+                    self.indicator_cache[symbol] = (df, df_with_indicators)
+                # Keep the columnar frame as one reference instead of boxing every
+                # row into a MarketData object; nothing in the BTC smirk pipeline
+                # consumes OHLCV rows, so they are not queued either.
+                self.latest_market_data[symbol] = df_with_indicators
                 
-                for data_item in market_data_list: # Renamed 'data' to 'data_item' to avoid conflict
-                    # OHLCV data still goes to a queue. If AgentManager only handles one type at a time,
-                    # this queue might be the same options_data_queue or a different one.
-                    # For simplicity, let's assume non-BTC data isn't processed further in this BTC-focused plan.
-                    # Or, ensure the old market_data_queue is used for this path if needed.
-                    # For this plan, let's put it in a generic queue that won't be picked up by smirk analysis.
-                    # To avoid error, we can use self.options_data_queue but it will be mixed type.
-                    # A better solution would be separate queues or a flag in the queued item.
-                    # For now, let's assume this path (non-BTC) is not the primary focus of the trading cycle.
-                    # We'll put it in 'options_data_queue' but the processor needs to be careful.
-                    # A cleaner way: have a separate market_data_queue for OHLCV if both are active.
-                    # Let's assume for this refactor, if symbol is not BTC, this queue won't be used by new logic.
-                    self.options_data_queue.put(data_item) # This will mix types if not careful.
-                                                       # Or use a different queue if WTI is still to be traded.
-
-                logger.info(f"Fetched and queued {len(market_data_list)} OHLCV records for {symbol}")
+                logger.info(f"Fetched {len(df_with_indicators)} OHLCV records for {symbol}")
             except Exception as e:
                 logger.error(f"Error fetching market data for {symbol}: {e}")
 
@@ -182,8 +235,7 @@ class AgentManager:
         
         results = []
         # Process all OptionsChainData items from the queue
-        while not self.options_data_queue.empty():
-            options_data = self.options_data_queue.get()
+        for options_data in self.options_data_queue.drain():
             if not isinstance(options_data, OptionsChainData): # Skip if not options data
                 logger.warning(f"Skipping item of type {type(options_data)} in options_data_queue during smirk analysis.")
                 continue
@@ -211,8 +263,7 @@ class AgentManager:
         signals = []
         # strategy_config = self.config.get('strategy', {}) # Not used directly here, but passed to smirk
 
-        while not self.volatility_analysis_queue.empty():
-            smirk_result = self.volatility_analysis_queue.get()
+        for smirk_result in self.volatility_analysis_queue.drain():
             try:
                 # Extract spot price used during smirk analysis (assuming it's in details)
                 spot_price = smirk_result.details.get("spot_price_at_analysis")
@@ -249,9 +300,7 @@ class AgentManager:
         
         try:
             # Get signals from queue
-            signals = []
-            while not self.signal_queue.empty() and len(signals) < max_trades:
-                signals.append(self.signal_queue.get())
+            signals = self.signal_queue.drain(max_trades)
             
             if not signals:
                 logger.warning("No trading signals available for trade execution")
@@ -260,54 +309,38 @@ class AgentManager:
             # Sort signals by confidence
             signals.sort(key=lambda x: x.confidence, reverse=True)
             
-            # Execute trades
+            # Build one order per BUY/SELL signal; HOLD signals produce no trade
+            symbol = self.config.get('trading', {}).get('symbol', 'BTC-USD') # Use configured symbol
+            orders = [
+                (signal, TradeExecution(
+                    date=datetime.now(),
+                    symbol=symbol,
+                    order_type=ORDER_TYPES[signal.signal],
+                    quantity=1.0,  # Will be calculated by the execution agent
+                    price=signal.price,
+                    status="PENDING"
+                ))
+                for signal in signals[:max_trades]
+                if signal.signal in ORDER_TYPES
+            ]
+            
+            # Execute the trades
+            # In a real system, this would call a broker API
+            # For now, we just record the trades, all in one database transaction
+            trade_ids = record_trade_batch(
+                [trade for _, trade in orders],
+                [f"Signal confidence: {signal.confidence}" for signal, _ in orders]
+            )
+            
             executed_trades = []
-            for signal in signals[:max_trades]:
-                if signal.signal == 1:  # BUY
-                    # Create a TradeExecution object
-                    trade = TradeExecution(
-                        date=datetime.now(),
-                        symbol=self.config.get('trading', {}).get('symbol', 'BTC-USD'), # Use configured symbol
-                        order_type="BUY",
-                        quantity=1.0,  # Will be calculated by the execution agent
-                        price=signal.price,
-                        status="PENDING"
-                    )
-                    
-                    # Execute the trade
-                    # In a real system, this would call a broker API
-                    # For now, we just record the trade
-                    trade_id = record_trade(trade, f"Signal confidence: {signal.confidence}")
-                    
-                    if trade_id:
-                        trade.status = "EXECUTED"
-                        trade.execution_id = str(trade_id)
-                        executed_trades.append(trade)
-                        logger.info(f"Executed BUY trade for CL=F at ${signal.price:.2f}")
-                    else:
-                        logger.error("Failed to execute BUY trade")
-                
-                elif signal.signal == -1:  # SELL
-                    # Create a TradeExecution object
-                    trade = TradeExecution(
-                        date=datetime.now(),
-                        symbol=self.config.get('trading', {}).get('symbol', 'BTC-USD'), # Use configured symbol
-                        order_type="SELL",
-                        quantity=1.0,  # Will be calculated by the execution agent
-                        price=signal.price,
-                        status="PENDING"
-                    )
-                    
-                    # Execute the trade
-                    trade_id = record_trade(trade, f"Signal confidence: {signal.confidence}")
-                    
-                    if trade_id:
-                        trade.status = "EXECUTED"
-                        trade.execution_id = str(trade_id)
-                        executed_trades.append(trade)
-                        logger.info(f"Executed SELL trade for CL=F at ${signal.price:.2f}")
-                    else:
-                        logger.error("Failed to execute SELL trade")
+            for (signal, trade), trade_id in zip(orders, trade_ids):
+                if trade_id:
+                    trade.status = "EXECUTED"
+                    trade.execution_id = str(trade_id)
+                    executed_trades.append(trade)
+                    logger.info(f"Executed {trade.order_type} trade for {trade.symbol} at ${signal.price:.2f}")
+                else:
+                    logger.error(f"Failed to execute {trade.order_type} trade")
             
             # Put executed trades in queue for other agents
             for trade in executed_trades:
@@ -328,7 +361,7 @@ class AgentManager:
         days_history = self.config.get('data_fetch', {}).get('days', 30) # Used for non-BTC OHLCV
 
         # Step 1: Fetch data for the current symbol
-        # This will put OptionsChainData or MarketData into self.options_data_queue
+        # This will put OptionsChainData into self.options_data_queue (or store OHLCV data)
         self.fetch_data_for_symbol(symbol=current_symbol, days=days_history) 
         
         signals = []
@@ -347,7 +380,7 @@ class AgentManager:
             logger.info(f"Symbol {current_symbol} is not BTC-USD. Standard OHLCV data was fetched. " +
                         "Skipping BTC-specific volatility/smirk-based signal generation for this cycle.")
             # To make this path work for WTI, you would need to:
-            # 1. Ensure OHLCV MarketData from options_data_queue is processed by a different analysis method.
+            # 1. Process the OHLCV frame in self.latest_market_data with a different analysis method.
             # 2. That method puts its results (e.g. old SentimentResult) to a queue.
             # 3. generate_trading_signals (or another method) consumes that for WTI strategy.
             # This is out of scope for the current BTC refactoring.
@@ -121,6 +121,62 @@ def record_trade(trade: TradeExecution, note: str = "", db_path: Optional[str] =
         logger.error(f"Error recording trade: {e}")
         return None
 
+def record_trade_batch(trades: List[TradeExecution], notes: List[str], db_path: Optional[str] = None) -> List[Optional[int]]:
+    """
+    Record several trades in the trade_history table with one insert and a single commit.
+    
+    Args:
+        trades (List[TradeExecution]): Trade execution details.
+        notes (List[str]): Note for each trade, in the same order.
+        db_path (str, optional): Path to the SQLite database. If None, uses the default path.
+        
+    Returns:
+        List[Optional[int]]: ID of each inserted record, or None for every trade if insertion failed.
+    """
+    if not trades:
+        return []
+    
+    if db_path is None:
+        db_path = os.path.join(get_data_directory(), "market_data.db")
+        
+    try:
+        conn = get_db_connection(db_path)
+        if conn is None:
+            return [None] * len(trades)
+            
+        cursor = conn.cursor()
+        
+        cursor.executemany("""
+            INSERT INTO trade_history (
+                execution_time, symbol, trade_type, executed_price, quantity, 
+                limit_price, status, execution_id, note
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                trade.date.isoformat(),
+                trade.symbol,
+                trade.order_type,
+                trade.price,
+                trade.quantity,
+                trade.limit_price,
+                trade.status,
+                trade.execution_id,
+                note
+            )
+            for trade, note in zip(trades, notes)
+        ])
+        # executemany does not report row ids, but rows inserted in one
+        # transaction on an AUTOINCREMENT key get consecutive ids
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        conn.commit()
+        conn.close()
+        
+        logger.info(f"Successfully recorded {len(trades)} trades")
+        return list(range(last_id - len(trades) + 1, last_id + 1))
+    except Exception as e:
+        logger.error(f"Error recording trades: {e}")
+        return [None] * len(trades)
+
 def count_open_trades(db_path: Optional[str] = None) -> int:
     """
     Count the number of open trades recorded in the trade_history.
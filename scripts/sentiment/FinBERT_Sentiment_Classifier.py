@@ -29,16 +29,22 @@ logger = logging.getLogger(__name__)
 
 
 class FinBERT_Sentiment_Classifier:
-    def __init__(self, model_name="ProsusAI/finbert", device=-1):
+    def __init__(self, model_name="ProsusAI/finbert", device=-1, batch_size=32, cache_size=10000):
         """
         Initialize the FinBERT sentiment classifier.
         
         Args:
             model_name (str): Identifier of the model to load from Hugging Face. Defaults to "ProsusAI/finbert".
             device (int): Device index to run the model on. -1 indicates CPU; use 0 (or higher) for GPU.
+            batch_size (int): Number of texts tokenized and run through the model per forward pass.
+            cache_size (int): Number of scored texts remembered so repeated headlines are not re-scored.
         """
         self.model_name = model_name
         self.device = device
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        # text -> processed result, oldest first
+        self._cache = {}
         logger.info("Initializing FinBERT sentiment classifier with model '%s' on device %s", model_name, device)
         
         # Initialize the sentiment analysis pipeline
@@ -65,28 +71,38 @@ class FinBERT_Sentiment_Classifier:
         if isinstance(texts, str):
             texts = [texts]
 
-        try:
-            raw_results = self.pipeline(texts)
-        except Exception as e:
-            logger.error("Error during sentiment prediction: %s", e)
-            return [{"label": "neutral", "score": 0.0} for _ in texts]
-
-        # Post-process results to standardize labels
-        processed_results = []
-        for res in raw_results:
-            # Convert label to lowercase and map to standard labels if necessary
-            label = res.get("label", "").lower()
-            if label in ["label_0", "negative"]:
-                label = "negative"
-            elif label in ["label_1", "positive"]:
-                label = "positive"
-            elif label in ["label_2", "neutral"]:
-                label = "neutral"
-            # Append processed result
-            processed_results.append({
-                "label": label,
-                "score": float(res.get("score", 0.0))
-            })
+        # Score each distinct text once; repeats within the call or from earlier calls reuse it
+        pending = [text for text in dict.fromkeys(texts) if text not in self._cache]
+
+        if pending:
+            try:
+                # Without batch_size the pipeline runs one forward pass per text
+                raw_results = self.pipeline(pending, batch_size=self.batch_size)
+            except Exception as e:
+                logger.error("Error during sentiment prediction: %s", e)
+                return [{"label": "neutral", "score": 0.0} for _ in texts]
+
+            # Post-process results to standardize labels
+            for text, res in zip(pending, raw_results):
+                # Convert label to lowercase and map to standard labels if necessary
+                label = res.get("label", "").lower()
+                if label in ["label_0", "negative"]:
+                    label = "negative"
+                elif label in ["label_1", "positive"]:
+                    label = "positive"
+                elif label in ["label_2", "neutral"]:
+                    label = "neutral"
+                self._cache[text] = {
+                    "label": label,
+                    "score": float(res.get("score", 0.0))
+                }
+
+        # Scatter the results back in input order; copies keep the cache intact
+        processed_results = [dict(self._cache[text]) for text in texts]
+
+        # Forget the oldest entries once the cache is full
+        while len(self._cache) > self.cache_size:
+            del self._cache[next(iter(self._cache))]
 
         return processed_results
 
@@ -21,8 +21,15 @@ from agent_interfaces import TradingSignal, VolatilitySmirkResult
 # Import utility functions
 from utils import get_data_directory, get_db_connection, setup_logger
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised when pyarrow is not installed
+    pq = None
+
 # Use relative paths with utility functions
 INDICATORS_DATA_PATH = os.path.join(get_data_directory(), "crude_oil_with_indicators.csv")
+# Written instead of the CSV by indicators.py when pyarrow is installed
+INDICATORS_PARQUET_PATH = os.path.join(get_data_directory(), "crude_oil_with_indicators.parquet")
 
 # Use relative path for SQLite database
 DB_PATH = os.path.join(get_data_directory(), "market_data.db")
@@ -217,18 +224,38 @@ class SimpleDecisionTree:
                 probabilities.append(0.5)  # 50% for hold
         return probabilities
 
+_INDICATOR_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist', 'ADX', 'EMA_9', 'EMA_21']
+
+def _load_parquet_with_indicators(filepath):
+    table = pq.read_table(filepath, columns=['Date', *_INDICATOR_FIELDS])
+    data = []
+    for row in table.to_pylist():
+        # Match the CSV loader: Date as text, missing values as None
+        processed_row = {'Date': str(row['Date'])}
+        for field in _INDICATOR_FIELDS:
+            value = row[field]
+            processed_row[field] = None if value is None or value != value else value
+        if processed_row['Volume'] is not None:
+            processed_row['Volume'] = int(processed_row['Volume'])
+        data.append(processed_row)
+    return data
+
 def load_data_with_indicators(filepath):
     """
-    Load data with indicators from a CSV file.
+    Load data with indicators from a CSV file, or a Parquet file written by indicators.py.
     
     Args:
-        filepath (str): Path to the CSV file
+        filepath (str): Path to the CSV or Parquet file
         
     Returns:
         list: List of dictionaries with the data
     """
     data = []
     try:
+        if filepath.endswith('.parquet'):
+            data = _load_parquet_with_indicators(filepath)
+            print(f"Loaded {len(data)} records from {filepath}")
+            return data
         with open(filepath, 'r') as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -484,8 +511,8 @@ def main():
     print("WTI Crude Oil Trading System - ML Strategy")
     print("==========================================")
     
-    # Use the absolute path for the CSV with indicators
-    data_path = INDICATORS_DATA_PATH
+    # Use the absolute path for the file with indicators
+    data_path = INDICATORS_PARQUET_PATH if pq is not None and os.path.exists(INDICATORS_PARQUET_PATH) else INDICATORS_DATA_PATH
     
     data = load_data_with_indicators(data_path)
     if not data:
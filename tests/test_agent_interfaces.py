@@ -6,8 +6,9 @@ This module contains tests for the agent interfaces defined in agent_interfaces.
 
 import unittest
 from datetime import datetime
+import numpy as np
 from agent_interfaces import (
-    TradingSignal, MarketData, SentimentResult, SatelliteData,
+    TradingSignal, MarketData, MarketDataFrame, SentimentResult, SatelliteData,
     TradeExecution, Position, Portfolio, RiskParameters, BacktestResult
 )
 
@@ -61,6 +62,41 @@ class TestMarketData(unittest.TestCase):
         self.assertEqual(data.close, 70.5)
         self.assertEqual(data.volume, 1000)
 
+class TestMarketDataFrame(unittest.TestCase):
+    """Tests for the MarketDataFrame class."""
+    
+    def setUp(self):
+        self.frame = MarketDataFrame(
+            date=np.array(["2024-01-01T00:00", "2024-01-01T01:00", "2024-01-01T02:00"], dtype="datetime64[ns]"),
+            open=[70.0, 70.5, 71.0],
+            high=[71.0, 71.5, 72.0],
+            low=[69.0, 69.5, 70.0],
+            close=[70.5, 71.0, 71.5],
+            volume=[1000, 1100, 1200]
+        )
+    
+    def test_row_access_builds_market_data(self):
+        """Test that indexing a MarketDataFrame returns a MarketData object."""
+        row = self.frame[1]
+        self.assertIsInstance(row, MarketData)
+        self.assertEqual(row.date, datetime(2024, 1, 1, 1, 0))
+        self.assertEqual(row.close, 71.0)
+        self.assertEqual(row.volume, 1100)
+        self.assertEqual(len(self.frame), 3)
+        self.assertEqual([data.open for data in self.frame], [70.0, 70.5, 71.0])
+    
+    def test_slice_returns_frame(self):
+        """Test that slicing a MarketDataFrame returns a shorter MarketDataFrame."""
+        tail = self.frame[1:]
+        self.assertIsInstance(tail, MarketDataFrame)
+        self.assertEqual(len(tail), 2)
+        self.assertEqual(tail.close.tolist(), [71.0, 71.5])
+    
+    def test_mismatched_columns(self):
+        """Test that columns of different lengths are rejected."""
+        with self.assertRaises(ValueError):
+            MarketDataFrame(date=self.frame.date, open=[70.0], high=[71.0], low=[69.0], close=[70.5], volume=[1000])
+
 class TestSentimentResult(unittest.TestCase):
     """Tests for the SentimentResult class."""
     
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bot.backtesting.engine import evaluate_strategy, performance_summary
+
+
+def sample_history() -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=4, freq="D")
+    return pd.DataFrame({"return": [0.01, -0.02, 0.03, 0.0], "signal": [1.0, -1.0, 0.5, 1.0]}, index=index)
+
+
+def test_evaluate_strategy_compounds_returns():
+    result = evaluate_strategy(sample_history(), lambda row: row["signal"])
+    expected_returns = np.array([0.01, 0.02, 0.015, 0.0])
+    assert result["return"].to_numpy() == pytest.approx(expected_returns)
+    assert result["equity"].to_numpy() == pytest.approx(np.cumprod(1 + expected_returns))
+
+
+def test_vectorized_signal_matches_row_signal():
+    history = sample_history()
+    row_result = evaluate_strategy(history, lambda row: row["signal"])
+    batch_result = evaluate_strategy(history, lambda frame: frame["signal"].to_numpy(), vectorized=True)
+    pd.testing.assert_frame_equal(row_result, batch_result)
+
+
+def test_missing_return_column_yields_flat_equity():
+    history = sample_history().drop(columns="return")
+    result = evaluate_strategy(history, lambda row: 1.0)
+    assert (result["equity"] == 1.0).all()
+
+
+def test_performance_summary_reports_drawdown():
+    equity = pd.Series([1.0, 1.2, 0.9, 1.1])
+    summary = performance_summary(equity)
+    assert summary["total_return"] == pytest.approx(0.1)
+    assert summary["max_drawdown"] == pytest.approx(0.9 / 1.2 - 1)
+
+
+def test_performance_summary_matches_pandas_reference():
+    equity = pd.Series(np.cumprod(1 + np.random.default_rng(0).normal(0, 0.01, 500)))
+    pct = equity.pct_change()
+    expected_sharpe = pct.mean() / (pct.std() + 1e-9) * np.sqrt(252)
+    summary = performance_summary(equity)
+    assert summary["sharpe"] == pytest.approx(expected_sharpe)
+    assert summary["max_drawdown"] == pytest.approx((equity / equity.cummax() - 1).min())
@@ -0,0 +1,94 @@
+import asyncio
+import json
+from typing import Dict, List
+
+import numpy as np
+
+from bot.execution.deribit import DeribitExecutionClient, Order
+
+
+class FakeResponse:
+    def __init__(self, payload: Dict):
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._payload).encode("utf-8")
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.calls: List[Dict] = []
+
+    def post(self, url: str, **kwargs) -> FakeResponse:
+        self.calls.append({"url": url, **kwargs})
+        return FakeResponse({"result": {"order": {"order_id": "abc"}}})
+
+
+def test_place_order_posts_to_side_endpoint():
+    session = RecordingSession()
+    client = DeribitExecutionClient(token="secret", session=session)
+    result = client.place_order(Order(instrument_name="BTC-PERPETUAL", side="sell", amount=10, price=60000.0))
+    assert result["result"]["order"]["order_id"] == "abc"
+    call = session.calls[0]
+    assert call["url"].endswith("/private/sell")
+    assert json.loads(call["data"])["price"] == 60000.0
+    assert call["headers"] == {"Content-Type": "application/json", "Authorization": "Bearer secret"}
+
+
+def test_place_order_accepts_numpy_scalars():
+    session = RecordingSession()
+    client = DeribitExecutionClient(session=session)
+    client.place_order(Order(instrument_name="BTC-PERPETUAL", side="buy", amount=np.int64(3), price=np.float64(60000.5)))
+    body = json.loads(session.calls[0]["data"])
+    assert body["amount"] == 3.0
+    assert body["price"] == 60000.5
+
+
+def test_clients_share_pooled_session_by_default():
+    assert DeribitExecutionClient().session is DeribitExecutionClient(token="x").session
+
+
+class FakeAsyncResponse:
+    def __init__(self, payload: Dict):
+        self._payload = payload
+
+    async def __aenter__(self) -> "FakeAsyncResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return json.dumps(self._payload).encode("utf-8")
+
+
+class RecordingAsyncSession(RecordingSession):
+    closed = False
+
+    def post(self, url: str, **kwargs) -> FakeAsyncResponse:
+        self.calls.append({"url": url, **kwargs})
+        return FakeAsyncResponse({"result": {"order": {"order_id": "async"}}})
+
+
+def test_place_order_async_uses_aio_session():
+    client = DeribitExecutionClient(token="secret", session=RecordingSession())
+    aio_session = RecordingAsyncSession()
+    client._aio_session = aio_session
+    result = asyncio.run(client.place_order_async(Order(instrument_name="BTC-PERPETUAL", side="buy", amount=1)))
+    assert result["result"]["order"]["order_id"] == "async"
+    assert aio_session.calls[0]["url"].endswith("/private/buy")
+    assert "price" not in json.loads(aio_session.calls[0]["data"])
+
+
+def test_place_order_logs_order_fields(caplog):
+    client = DeribitExecutionClient(session=RecordingSession())
+    with caplog.at_level("INFO", logger="bot.execution.deribit"):
+        client.place_order(Order(instrument_name="BTC-PERPETUAL", side="buy", amount=2))
+    assert "instrument=BTC-PERPETUAL side=buy amount=2" in caplog.text
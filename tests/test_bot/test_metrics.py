@@ -0,0 +1,102 @@
+import threading
+import time
+
+from bot.observability.metrics import FixedHistogram, MetricsRegistry
+
+
+def test_counters_sum_across_threads():
+    registry = MetricsRegistry.create()
+
+    def work() -> None:
+        for _ in range(1000):
+            registry.inc("orders")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.inc("fills", 2.5)
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"orders": 4000.0, "fills": 2.5}
+    assert registry.counters == {"orders": 4000.0, "fills": 2.5}
+
+
+class _YieldingIncrement(float):
+    """Increment that releases the GIL between reading and writing the slot."""
+
+    def __radd__(self, other: float) -> float:
+        time.sleep(0)
+        return other + float(self)
+
+
+def test_concurrent_increments_are_never_lost():
+    registry = MetricsRegistry.create()
+    thread_count, per_thread = 8, 500
+    barrier = threading.Barrier(thread_count)
+    step = _YieldingIncrement(1.0)
+
+    def work() -> None:
+        barrier.wait()
+        for _ in range(per_thread):
+            registry.inc("ticks", step)
+
+    threads = [threading.Thread(target=work) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.snapshot()["counters"] == {"ticks": float(thread_count * per_thread)}
+    assert registry.counters == {"ticks": float(thread_count * per_thread)}
+
+
+def test_exited_threads_fold_their_shards():
+    registry = MetricsRegistry.create()
+
+    def work() -> None:
+        registry.inc("jobs", 2.0)
+
+    for _ in range(5):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    registry.inc("jobs")
+    assert registry.snapshot()["counters"] == {"jobs": 11.0}
+    assert registry.counters == {"jobs": 11.0}
+    # Only the base accumulator and the main thread's shard remain
+    assert len(registry._shards) == 2
+
+
+def test_timer_records_samples():
+    registry = MetricsRegistry.create()
+    with registry.time("fetch"):
+        pass
+    timer = registry.snapshot()["timers"]["fetch"]
+    assert timer["count"] == 1
+    assert set(timer) >= {"p50", "p95", "p99"}
+
+
+def test_fixed_histogram_percentiles_are_within_bucket_error():
+    histogram = FixedHistogram()
+    for millis in range(1, 101):
+        histogram.record(millis / 1000)
+    assert 0.050 <= histogram.percentile(50) <= 0.050 * FixedHistogram.GROWTH
+    assert 0.099 <= histogram.percentile(99) <= 0.099 * FixedHistogram.GROWTH
+    other = FixedHistogram()
+    other.record(5.0)
+    histogram.merge(other)
+    assert histogram.count == 101
+    assert histogram.percentile(100) >= 5.0
+
+
+def test_snapshot_only_refreshes_updated_metrics():
+    registry = MetricsRegistry.create()
+    registry.inc("orders")
+    registry.gauge("depth", 3.0)
+    first = registry.snapshot()
+    first["counters"]["orders"] = -1.0
+    registry.inc("orders", 2.0)
+    second = registry.snapshot()
+    assert second["counters"] == {"orders": 3.0}
+    assert second["gauges"] == {"depth": 3.0}
+    assert registry.snapshot() == second
@@ -1,6 +1,13 @@
 import numpy as np
 
-from bot.risk.engine import RiskConfig, conditional_var, compute_risk_budget, kelly_position_size
+from bot.risk.engine import (
+    RiskConfig,
+    RollingCVaR,
+    compute_risk_budget,
+    compute_risk_budget_vec,
+    conditional_var,
+    kelly_position_size,
+)
 
 
 def test_kelly_position_size_bounds():
@@ -17,3 +24,41 @@ def test_risk_budget_uses_config():
     budget = compute_risk_budget(signal_strength=0.2, config=config)
     assert budget["allocation"] <= config.capital
     assert budget["max_loss"] == budget["allocation"] * config.max_drawdown
+
+
+def test_conditional_var_matches_sorted_tail():
+    returns = np.random.default_rng(7).normal(0.0, 0.02, size=1000)
+    expected = np.sort(returns)[:50].mean()
+    assert np.isclose(conditional_var(returns, confidence_level=0.95), expected)
+    assert conditional_var(np.array([0.01, -0.03]), confidence_level=0.0) == np.mean([0.01, -0.03])
+
+
+def test_kelly_position_size_matches_textbook_formula():
+    for edge in np.linspace(0.01, 2.0, 25):
+        for win_prob in np.linspace(0.05, 0.95, 19):
+            odds = edge / (1 - win_prob)
+            expected = min(max((win_prob * (odds + 1) - 1) / odds, 0.0), 1.0) * 1000.0
+            assert np.isclose(kelly_position_size(edge, win_prob, 1000.0), expected)
+    assert kelly_position_size(edge=-0.1, win_prob=0.55, capital=1000.0) == 0.0
+    assert kelly_position_size(edge=0.1, win_prob=1.0, capital=1000.0) == 0.0
+
+
+def test_risk_budget_vec_matches_scalar():
+    config = RiskConfig(capital=50000)
+    strengths = np.array([-0.5, 0.0, 0.05, 0.2, 0.6, 0.99, 1.0, 1.5])
+    budget = compute_risk_budget_vec(strengths, config)
+    for i, strength in enumerate(strengths):
+        expected = compute_risk_budget(float(strength), config)
+        assert np.isclose(budget["allocation"][i], expected["allocation"])
+        assert np.isclose(budget["max_loss"][i], expected["max_loss"])
+
+
+def test_rolling_cvar_matches_batch_on_each_window():
+    returns = np.random.default_rng(11).normal(0.0, 0.02, size=300)
+    rolling = RollingCVaR(window=100, confidence_level=0.9)
+    assert rolling.value() == 0.0
+    for i, value in enumerate(returns):
+        rolling.update(value)
+        window = returns[max(0, i - 99): i + 1]
+        assert np.isclose(rolling.value(), conditional_var(window, confidence_level=0.9))
+    assert len(rolling) == 100
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from bot.reporting.risk_report import RiskReport
+
+
+def test_render_markdown_lists_metrics():
+    report = RiskReport(generated_at=datetime(2024, 5, 24, 8, 0), metrics={"value_at_risk": 0.12345, "max_drawdown": -0.2})
+    assert report.render_markdown() == (
+        "# Daily Risk Report\n"
+        "Generated at: 2024-05-24T08:00:00\n"
+        "\n"
+        "- **Value At Risk**: 0.1235\n"
+        "- **Max Drawdown**: -0.2000"
+    )
+    assert RiskReport(generated_at=datetime(2024, 5, 24), metrics={}).render_markdown().endswith("T00:00:00\n")
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Dict, List
+
+from bot.infrastructure.scheduler import DataChannel, Scheduler
+from bot.observability.metrics import MetricsRegistry
+
+
+def test_channel_batches_in_publish_order_and_tracks_high_water():
+    async def scenario() -> List[List[Dict]]:
+        metrics = MetricsRegistry.create()
+        channel = DataChannel(name="ticks", metrics=metrics)
+        for i in range(5):
+            await channel.publish({"i": i})
+        first = await channel.subscribe_batch(max_n=3)
+        second = await channel.subscribe_batch(max_n=3)
+        assert channel.high_water == 5
+        assert metrics.snapshot()["gauges"]["channel.ticks.high_water"] == 5
+        return [first, second]
+
+    first, second = asyncio.run(scenario())
+    assert [p["i"] for p in first] == [0, 1, 2]
+    assert [p["i"] for p in second] == [3, 4]
+
+
+def test_scheduler_dispatches_to_consumers():
+    async def scenario() -> List[Dict]:
+        received: List[Dict] = []
+        done = asyncio.Event()
+
+        async def consumer(payload: Dict) -> None:
+            received.append(payload)
+            if len(received) == 3:
+                done.set()
+
+        scheduler = Scheduler()
+        scheduler.register_consumer("orders", consumer)
+        await scheduler.start()
+        channel = scheduler.get_channel("orders")
+        for i in range(3):
+            await channel.publish({"i": i})
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await scheduler.stop()
+        return received
+
+    assert [p["i"] for p in asyncio.run(scenario())] == [0, 1, 2]
+
+
+def test_scheduler_runs_consumers_of_a_payload_concurrently():
+    async def scenario() -> List[str]:
+        events: List[str] = []
+        release = asyncio.Event()
+        done = asyncio.Event()
+
+        async def slow(payload: Dict) -> None:
+            events.append("slow-start")
+            await release.wait()
+            events.append("slow-end")
+            done.set()
+
+        async def fast(payload: Dict) -> None:
+            events.append("fast")
+            release.set()
+
+        scheduler = Scheduler()
+        scheduler.register_consumer("orders", slow)
+        scheduler.register_consumer("orders", fast)
+        await scheduler.start()
+        await scheduler.get_channel("orders").publish({"i": 0})
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await scheduler.stop()
+        return events
+
+    assert asyncio.run(scenario()) == ["slow-start", "fast", "slow-end"]
+
+
+def test_scheduler_stop_keeps_undispatched_payloads_in_channel():
+    async def scenario() -> List[Dict]:
+        started = asyncio.Event()
+
+        async def blocking(payload: Dict) -> None:
+            started.set()
+            await asyncio.Event().wait()
+
+        scheduler = Scheduler()
+        scheduler.register_consumer("orders", blocking)
+        channel = scheduler.get_channel("orders")
+        for i in range(4):
+            await channel.publish({"i": i})
+        await scheduler.start()
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await channel.publish({"i": 4})
+        await scheduler.stop()
+        return await channel.subscribe_batch()
+
+    assert [p["i"] for p in asyncio.run(scenario())] == [1, 2, 3, 4]
+
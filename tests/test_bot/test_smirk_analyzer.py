@@ -23,3 +23,81 @@ def test_moments_are_computed():
 def test_feature_helper_returns_values():
     features = compute_smirk_features(sample_records())
     assert any(key.endswith("_mean") for key in features)
+
+
+def test_moments_match_pandas_estimators():
+    records = sample_records() + [
+        {"instrument_name": "BTC-30JUN23-36000-C", "expiry": "2023-06-30", "strike": 36000, "iv": 0.72, "delta": 0.25, "gamma": 0.07},
+        {"instrument_name": "BTC-30JUN23-38000-C", "expiry": "2023-06-30", "strike": 38000, "iv": 0.9, "delta": 0.2, "gamma": 0.06},
+    ]
+    iv = pd.Series([record["iv"] for record in records])
+    moments = SmirkAnalyzer(records).calculate_moments(pd.Timestamp("2023-06-30"))
+    assert moments["mean"] == pytest.approx(iv.mean())
+    assert moments["skew"] == pytest.approx(iv.skew())
+    assert moments["kurtosis"] == pytest.approx(iv.kurtosis())
+
+
+def test_feature_helper_covers_every_expiry():
+    records = sample_records() + [
+        {"instrument_name": "BTC-28JUL23-30000-C", "expiry": "2023-07-28", "strike": 30000, "iv": 0.45, "delta": 0.5, "gamma": 0.1},
+    ]
+    features = compute_smirk_features(records)
+    assert features["2023-06-30_mean"] == pytest.approx(0.55)
+    assert features["2023-07-28_mean"] == pytest.approx(0.45)
+    assert compute_smirk_features([]) == {}
+
+
+def test_fit_vol_surface_reuses_interpolator():
+    records = []
+    for expiry, base in (("2023-06-30", 0.5), ("2023-07-28", 0.55), ("2023-09-29", 0.6)):
+        for strike in range(26000, 40000, 2000):
+            for option_type, bump in (("C", 0.0), ("P", 0.01)):
+                records.append({
+                    "instrument_name": f"BTC-{strike}-{option_type}",
+                    "expiry": expiry,
+                    "strike": strike,
+                    "iv": base + abs(strike - 33000) / 1e5 + bump,
+                    "delta": 0.0,
+                    "gamma": 0.0,
+                })
+    analyzer = SmirkAnalyzer(records)
+    surface = analyzer.fit_vol_surface()
+    interpolator = analyzer._surface_interp
+    assert len(surface) == 100 * 100
+    assert surface["iv"].between(0.4, 0.8).all()
+    analyzer.fit_vol_surface()
+    assert analyzer._surface_interp is interpolator
+
+
+def test_columns_are_stored_as_arrays():
+    analyzer = SmirkAnalyzer(sample_records())
+    assert analyzer.iv.dtype == float
+    assert analyzer.expiry.dtype.kind == "M"
+    assert analyzer._df is None
+    assert list(analyzer.df["strike"]) == [30000, 32000, 34000]
+
+
+def test_surface_slice_is_sorted_by_strike():
+    records = list(reversed(sample_records())) + [
+        {"instrument_name": "BTC-28JUL23-31000-C", "expiry": "2023-07-28", "strike": 31000, "iv": 0.45, "delta": 0.5, "gamma": 0.1},
+    ]
+    analyzer = SmirkAnalyzer(records)
+    june = analyzer.surface_slice(pd.Timestamp("2023-06-30"))
+    assert list(june["strike"]) == [30000, 32000, 34000]
+    assert analyzer.surface_slice(pd.Timestamp("2023-08-25")).empty
+
+
+def test_detect_regimes_matches_grouped_rolling_reference():
+    records = sample_records() + [
+        {"instrument_name": "BTC-30JUN23-36000-C", "expiry": "2023-06-30", "strike": 36000, "iv": 0.95, "delta": 0.25, "gamma": 0.07},
+        {"instrument_name": "BTC-28JUL23-30000-C", "expiry": "2023-07-28", "strike": 30000, "iv": 0.45, "delta": 0.5, "gamma": 0.1},
+        {"instrument_name": "BTC-28JUL23-32000-C", "expiry": "2023-07-28", "strike": 32000, "iv": 0.45, "delta": 0.4, "gamma": 0.1},
+    ]
+    regimes = SmirkAnalyzer(records).detect_regimes(window=3)
+    grouped = regimes.groupby("expiry")["iv"]
+    expected_mean = grouped.transform(lambda s: s.rolling(3, min_periods=1).mean())
+    expected_std = grouped.transform(lambda s: s.rolling(3, min_periods=1).std())
+    assert regimes["rolling_mean"].to_numpy() == pytest.approx(expected_mean.to_numpy(), nan_ok=True)
+    assert regimes["rolling_std"].to_numpy() == pytest.approx(expected_std.to_numpy(), nan_ok=True)
+    assert list(regimes["regime"].cat.categories) == ["bearish", "neutral", "bullish"]
+    assert regimes["regime"].isna().sum() == 3
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Dict
 
+import numpy as np
+
 from bot.strategy.engine import StrategyConfig, StrategyEngine
 
 
@@ -30,3 +32,39 @@ def test_signal_is_zero_when_below_threshold():
     )
     result = engine.generate_signal()
     assert result["signal"] == 0
+
+
+def test_combine_features_applies_ensemble_weights():
+    engine = StrategyEngine(
+        providers={},
+        config=StrategyConfig(ensemble_weights={"smirk": 2.0}),
+    )
+    combined = engine._combine_features({"smirk": {"alpha": 0.5, "beta": 1.0}, "macro": {"alpha": -0.25}})
+    assert combined == {"alpha": 0.75, "beta": 2.0}
+    # Keys seen on earlier calls are neither reported nor retained.
+    assert engine._combine_features({"macro": {"gamma": 0.1}}) == {"gamma": 0.1}
+    assert engine._combine_feature_vector({"macro": {"2024-05-24": 0.2}})[0] == ["2024-05-24"]
+    assert engine._combine_features({}) == {}
+
+
+def test_score_squashes_features_with_tanh():
+    engine = StrategyEngine(providers={}, config=StrategyConfig(risk_aversion=0.5, min_signal_strength=0.0))
+    values = np.array([0.5, -0.2, 1.5])
+    expected = float(np.tanh(values).mean()) * 0.5
+    assert np.isclose(engine._score_combined_features(values), expected)
+    assert engine._score_combined_features(np.array([])) == 0.0
+
+
+def test_weight_vector_is_rebuilt_on_invalidate():
+    config = StrategyConfig(risk_aversion=0.0, min_signal_strength=0.0, ensemble_weights={"smirk": 2.0})
+    engine = StrategyEngine(providers={"smirk": DummyProvider(0.25)}, config=config)
+    assert engine.generate_signal()["features"] == {"alpha": 0.5}
+    cached = engine._weight_vec
+    assert engine.generate_signal()["features"] == {"alpha": 0.5}
+    assert engine._weight_vec is cached
+    config.ensemble_weights["smirk"] = 4.0
+    engine.invalidate_weights()
+    assert engine.generate_signal()["features"] == {"alpha": 1.0}
+    # A different provider set rebuilds the vector on its own
+    engine.providers["macro"] = DummyProvider(0.5)
+    assert engine.generate_signal()["features"] == {"alpha": 1.5}
@@ -0,0 +1,55 @@
+"""
+Tests for the per-credential Deribit client cache in scripts/data_fetch/btc_options_fetch.py.
+"""
+
+from typing import List
+
+import pytest
+
+from scripts.data_fetch import btc_options_fetch
+
+
+class FakeClient:
+    def __init__(self, *, client_id=None, client_secret=None) -> None:
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def clients(monkeypatch) -> List[FakeClient]:
+    created: List[FakeClient] = []
+
+    def factory(**kwargs) -> FakeClient:
+        created.append(FakeClient(**kwargs))
+        return created[-1]
+
+    monkeypatch.setattr(btc_options_fetch, "DeribitMarketDataClient", factory)
+    monkeypatch.setattr(btc_options_fetch, "_CLIENTS", type(btc_options_fetch._CLIENTS)())
+    return created
+
+
+def test_clients_are_reused_per_client_id(clients):
+    first = btc_options_fetch._client_for("id", "secret")
+    assert btc_options_fetch._client_for("id", "secret") is first
+    assert btc_options_fetch._client_for("id", None) is first
+
+    rotated = btc_options_fetch._client_for("id", "new-secret")
+    assert rotated is not first and rotated.client_secret == "new-secret"
+    assert first.closed and not rotated.closed
+    assert list(btc_options_fetch._CLIENTS) == ["id"]
+
+
+def test_evicted_clients_are_closed(clients):
+    for index in range(btc_options_fetch._MAX_CLIENTS):
+        btc_options_fetch._client_for(f"id-{index}", "secret")
+    # Touching the oldest entry makes id-1 the least recently used one
+    btc_options_fetch._client_for("id-0", "secret")
+    btc_options_fetch._client_for("extra", "secret")
+
+    assert [client.client_id for client in clients if client.closed] == ["id-1"]
+    assert len(btc_options_fetch._CLIENTS) == btc_options_fetch._MAX_CLIENTS
+    assert "id-1" not in btc_options_fetch._CLIENTS
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import json
+import time
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Dict, Tuple
 
 import pytest
 
-from bot.data.deribit_client import DeribitMarketDataClient
+from bot.data.deribit_client import DeribitMarketDataClient, TokenBucket
 
 
 class FakeResponse:
@@ -16,6 +18,10 @@ class FakeResponse:
     def raise_for_status(self) -> None:  # pragma: no cover - no errors triggered in tests
         return None
 
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._payload).encode("utf-8")
+
     def json(self) -> Dict:
         return self._payload
 
@@ -58,38 +64,46 @@ def sample_responses() -> Dict[Tuple[str, str, Tuple[Tuple[str, object], ...]],
         "strike": 60000.0,
         "option_type": "put",
     }
+    call_summary = {
+        "instrument_name": "BTC-24MAY24-60000-C",
+        "underlying_price": 61234.5,
+        "mark_iv": 0.65,
+        "volume": 123,
+        "open_interest": 456,
+        "delta": 0.42,
+        "gamma": 0.001,
+        "theta": -0.5,
+        "vega": 25.0,
+        "last_price": 950.0,
+    }
+    put_summary = {
+        "instrument_name": "BTC-24MAY24-60000-P",
+        "underlying_price": 61234.5,
+        "mark_iv": 0.72,
+        "volume": 45,
+        "open_interest": 890,
+        "delta": -0.58,
+        "gamma": 0.002,
+        "theta": -0.4,
+        "vega": 30.0,
+        "last_price": 1020.0,
+    }
     return {
         ("GET", f"{base_url}/public/get_instruments", (
             ("currency", "BTC"),
             ("expired", False),
             ("kind", "option"),
         )): {"result": [instrument_call, instrument_put]},
+        ("GET", f"{base_url}/public/get_book_summary_by_currency", (
+            ("currency", "BTC"),
+            ("kind", "option"),
+        )): {"result": [call_summary, put_summary]},
         ("GET", f"{base_url}/public/get_book_summary_by_instrument", (
             ("instrument_name", "BTC-24MAY24-60000-C"),
-        )): {"result": [{
-            "underlying_price": 61234.5,
-            "mark_iv": 0.65,
-            "volume": 123,
-            "open_interest": 456,
-            "delta": 0.42,
-            "gamma": 0.001,
-            "theta": -0.5,
-            "vega": 25.0,
-            "last_price": 950.0,
-        }]},
+        )): {"result": [call_summary]},
         ("GET", f"{base_url}/public/get_book_summary_by_instrument", (
             ("instrument_name", "BTC-24MAY24-60000-P"),
-        )): {"result": [{
-            "underlying_price": 61234.5,
-            "mark_iv": 0.72,
-            "volume": 45,
-            "open_interest": 890,
-            "delta": -0.58,
-            "gamma": 0.002,
-            "theta": -0.4,
-            "vega": 30.0,
-            "last_price": 1020.0,
-        }]},
+        )): {"result": [put_summary]},
     }
 
 
@@ -122,3 +136,69 @@ def test_fetch_options_chain_uses_cache(tmp_path: Path, sample_responses) -> Non
     cached_client = DeribitMarketDataClient(session=FailSession(), cache_dir=cache_dir)
     chains = cached_client.fetch_options_chain(expiries=["2024-05-24T08:00:00Z"], currency="BTC")
     assert len(chains) == 1
+
+
+def test_fetch_options_chain_uses_single_bulk_summary_call(tmp_path: Path, sample_responses) -> None:
+    session = FakeSession(sample_responses)
+    client = DeribitMarketDataClient(session=session, cache_dir=tmp_path)
+    _ = client.fetch_options_chain(expiries=["2024-05-24T08:00:00Z"], currency="BTC")
+    endpoints = [url.rsplit("/", 1)[-1] for _, url, _ in session.calls]
+    assert sorted(endpoints) == ["get_book_summary_by_currency", "get_instruments"]
+
+
+def test_fetch_options_chain_per_instrument_fallback(tmp_path: Path, sample_responses) -> None:
+    session = FakeSession(sample_responses)
+    client = DeribitMarketDataClient(session=session, cache_dir=tmp_path, bulk_book_summary=False, strict=True)
+    chains = client.fetch_options_chain(expiries=["2024-05-24T08:00:00Z"], currency="BTC")
+    put = next(c for c in chains[0].contracts if c.contract_type == "put")
+    assert put.implied_volatility == pytest.approx(0.72)
+    endpoints = [url.rsplit("/", 1)[-1] for _, url, _ in session.calls]
+    assert endpoints.count("get_book_summary_by_instrument") == 2
+
+
+def test_normalize_expiries_accepts_iso_and_tenor_inputs(tmp_path: Path) -> None:
+    client = DeribitMarketDataClient(session=FailSession(), cache_dir=tmp_path)
+    normalized = client._normalize_expiries(["2024-05-24", "2024-05-24T08:00:00Z", "7D"])
+    assert normalized[0] == datetime(2024, 5, 24, tzinfo=UTC)
+    assert normalized[1] == datetime(2024, 5, 24, 8, 0, 0, tzinfo=UTC)
+    assert normalized[2] > datetime.now(UTC)
+    with pytest.raises(ValueError):
+        client._normalize_expiries(["next friday"])
+
+
+def test_expired_cache_entry_is_refetched(tmp_path: Path, sample_responses) -> None:
+    _ = DeribitMarketDataClient(session=FakeSession(sample_responses), cache_dir=tmp_path).fetch_options_chain(
+        expiries=["2024-05-24T08:00:00Z"], currency="BTC"
+    )
+    session = FakeSession(sample_responses)
+    client = DeribitMarketDataClient(session=session, cache_dir=tmp_path, cache_ttl=-1)
+    chains = client.fetch_options_chain(expiries=["2024-05-24T08:00:00Z"], currency="BTC")
+    assert len(chains) == 1
+    assert session.calls
+
+
+def test_token_bucket_allows_burst_then_throttles() -> None:
+    bucket = TokenBucket(rate=50.0, capacity=3)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.02
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.015
+
+
+def test_close_leaves_caller_supplied_session_open(tmp_path: Path) -> None:
+    class ClosableSession(FailSession):
+        closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    supplied = ClosableSession()
+    DeribitMarketDataClient(session=supplied, cache_dir=tmp_path).close()
+    assert not supplied.closed
+
+    client = DeribitMarketDataClient(cache_dir=tmp_path)
+    owned = client._session = ClosableSession()
+    client.close()
+    assert owned.closed
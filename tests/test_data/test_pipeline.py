@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Sequence
+
+from agent_interfaces import OptionsChainData
+from bot.data.deribit_client import DeribitMarketDataClient
+from bot.data.pipeline import ChainCache, MarketDataPipeline
+
+
+class CountingClient(DeribitMarketDataClient):
+    def __init__(self, cache_dir: Path) -> None:
+        super().__init__(cache_dir=cache_dir, rate_limit_per_sec=None)
+        self.requested: List[List[str]] = []
+        self.refreshes: List[bool] = []
+
+    def fetch_options_chain(
+        self, *, expiries: Sequence[str], currency: str = "BTC", refresh: bool = False, **_: object
+    ) -> List[OptionsChainData]:
+        self.requested.append(list(expiries))
+        self.refreshes.append(refresh)
+        return [
+            OptionsChainData(underlying_symbol=currency, spot_price=60000.0, expiry_date=expiry_dt, contracts=[])
+            for expiry_dt in self._normalize_expiries(expiries)
+        ]
+
+
+def test_pipeline_only_fetches_missing_expiries(tmp_path: Path) -> None:
+    client = CountingClient(tmp_path / "client")
+    pipeline = MarketDataPipeline(client=client, cache=ChainCache(tmp_path / "chains"))
+    future = (datetime.now(UTC) + timedelta(days=30)).date().isoformat()
+
+    first = pipeline.fetch_option_chains(["2024-05-24", future])
+    second = pipeline.fetch_option_chains(["2024-05-24", future, "2024-06-28"])
+
+    assert len(first) == 2 and len(second) == 3
+    assert [chain.expiry_date.date().isoformat() for chain in second] == ["2024-05-24", "2024-06-28", future]
+    assert len(client.requested) == 2
+    assert len(client.requested[1]) == 1
+
+    pipeline.fetch_option_chains([future], refresh=True)
+    assert len(client.requested) == 3
+    # Misses never fall back to the client's longer-lived response cache
+    assert client.refreshes == [True, True, True]
+
+
+def test_chain_cache_survives_restart_and_expires_live_chains(tmp_path: Path) -> None:
+    chain = OptionsChainData(
+        underlying_symbol="BTC",
+        spot_price=60000.0,
+        expiry_date=datetime(2024, 5, 24, 8, tzinfo=UTC),
+        contracts=[],
+    )
+    ChainCache(tmp_path).put("BTC", "2024-05-24", chain)
+    restored = ChainCache(tmp_path).get("BTC", "2024-05-24")
+    assert restored == chain
+
+    live = chain.model_copy(update={"expiry_date": datetime.now(UTC) + timedelta(days=7)})
+    cache = ChainCache(tmp_path, live_ttl=-1.0)
+    cache.put("BTC", "7D", live)
+    assert cache.get("BTC", "7D") is None
+
+
+def test_chain_cache_prunes_least_recently_used(tmp_path: Path) -> None:
+    cache = ChainCache(tmp_path)
+    for day in (24, 25, 26):
+        chain = OptionsChainData(
+            underlying_symbol="BTC", spot_price=1.0, expiry_date=datetime(2024, 5, day, 8, tzinfo=UTC), contracts=[]
+        )
+        cache.put("BTC", f"2024-05-{day}", chain)
+    entry_size = max(path.stat().st_size for path in (tmp_path / "BTC").glob("*.json"))
+    cache.max_disk_bytes = 2 * entry_size
+    for age, expiry in enumerate(("2024-05-26", "2024-05-25", "2024-05-24")):
+        path = cache._disk_for("BTC")._path_for(expiry)
+        os.utime(path, (1_000_000 - age, 1_000_000 - age))
+    cache.prune()
+    fresh = ChainCache(tmp_path)
+    assert fresh.get("BTC", "2024-05-24") is None
+    assert fresh.get("BTC", "2024-05-26") is not None
+
+
+def test_chain_cache_prunes_only_every_few_writes(tmp_path: Path) -> None:
+    cache = ChainCache(tmp_path, prune_every=3)
+    pruned: List[int] = []
+    cache.prune = lambda: (pruned.append(cache._writes_since_prune), ChainCache.prune(cache))
+    for day in range(1, 8):
+        chain = OptionsChainData(
+            underlying_symbol="BTC", spot_price=1.0, expiry_date=datetime(2024, 5, day, 8, tzinfo=UTC), contracts=[]
+        )
+        cache.put("BTC", f"2024-05-0{day}", chain)
+        cache.maybe_prune()
+    assert pruned == [3, 3]
+
+
+class _ListedSession:
+    """Answers Deribit with a single listed expiry a week out."""
+
+    def __init__(self) -> None:
+        self.expiry = (datetime.now(UTC) + timedelta(days=7)).replace(hour=8, minute=0, second=0, microsecond=0)
+
+    def request(self, method: str, url: str, **kwargs: object) -> object:
+        if url.endswith("get_instruments"):
+            result = [{
+                "instrument_name": "BTC-7D-60000-C",
+                "expiration_timestamp": int(self.expiry.timestamp() * 1000),
+                "strike": 60000.0,
+                "option_type": "call",
+            }]
+        else:
+            result = [{"instrument_name": "BTC-7D-60000-C", "underlying_price": 60000.0}]
+        content = json.dumps({"result": result}).encode("utf-8")
+        return SimpleNamespace(raise_for_status=lambda: None, content=content, json=lambda: json.loads(content))
+
+
+def test_past_dated_request_resolved_to_live_chain_uses_live_ttl(tmp_path: Path) -> None:
+    session = _ListedSession()
+    client = DeribitMarketDataClient(session=session, cache_dir=tmp_path / "client", rate_limit_per_sec=None)
+    cache = ChainCache(tmp_path / "chains", live_ttl=30.0)
+    pipeline = MarketDataPipeline(client=client, cache=cache)
+
+    (chain,) = pipeline.fetch_option_chains(["2024-05-24"])
+
+    # The client only lists unexpired contracts and picks the closest one
+    assert chain.expiry_date.date().isoformat() == "2024-05-24"
+    assert chain.contract_expiry == session.expiry
+    now = time.time()
+    assert cache.get("BTC", "2024-05-24", now=now) is not None
+    assert cache.get("BTC", "2024-05-24", now=now + 31.0) is None
+    assert ChainCache(tmp_path / "chains").get("BTC", "2024-05-24", now=now + 31.0) is None
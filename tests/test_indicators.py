@@ -0,0 +1,104 @@
+"""
+Tests for the technical indicator calculations in scripts/indicators/indicators.py.
+
+The compiled numba kernel must give the same values as the pandas reference
+implementation, and streaming a file in chunks must give the same values as
+one pass over the whole series.
+"""
+
+import importlib
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="module")
+def indicators(tmp_path_factory):
+    # The module logs to logs/indicators.log relative to the working directory
+    workdir = tmp_path_factory.mktemp("indicators")
+    (workdir / "logs").mkdir()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        return importlib.import_module("scripts.indicators.indicators")
+    finally:
+        os.chdir(cwd)
+
+
+def _prices(rows: int = 300) -> pd.DataFrame:
+    """Random-walk OHLCV bars with NaN gaps and flat stretches."""
+    rng = np.random.default_rng(7)
+    close = 70 + np.cumsum(rng.normal(0, 0.5, rows))
+    # Flat stretches: the first one covers the whole 14-bar Wilder warm-up, so
+    # gains, losses and true range all average to zero and RSI and +DI/-DI
+    # divide 0 by 0; the later ones only decay the averages towards zero
+    close[:30] = close[0]
+    close[150:170] = close[150]
+    high = close + rng.uniform(0, 1, rows)
+    low = close - rng.uniform(0, 1, rows)
+    high[:30] = low[:30] = close[:30]
+    high[150:170] = low[150:170] = close[150:170]
+    # NaN gaps: missing highs/lows are kept, rows without a close are dropped
+    high[[40, 41, 90, 200]] = np.nan
+    low[[41, 91, 201]] = np.nan
+    close[[45, 100, 101, 250]] = np.nan
+    return pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=rows, freq="h"),
+        "Open": close,
+        "High": high,
+        "Low": low,
+        "Close": close,
+        "Volume": rng.integers(1000, 5000, rows).astype(float),
+    })
+
+
+def test_numba_kernel_matches_pandas_fallback(indicators, monkeypatch):
+    if not indicators.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    prices = _prices()
+    compiled = indicators.calculate_indicators(prices)
+    monkeypatch.setattr(indicators, "_compute_indicators", indicators._compute_indicators_pandas)
+    reference = indicators.calculate_indicators(prices)
+
+    assert len(compiled) == len(reference) == prices["Close"].notna().sum()
+    for column in indicators.INDICATOR_COLUMNS:
+        np.testing.assert_allclose(
+            compiled[column].to_numpy(), reference[column].to_numpy(), rtol=1e-9, equal_nan=True, err_msg=column
+        )
+    # The fixture must actually exercise the edge cases it was built for
+    assert reference["RSI"].loc[14:29].isna().all() and reference["+DI"].loc[14:29].isna().all()
+    assert (reference["TR"].loc[151:169] == 0).all()
+    assert reference["TR"].loc[[40, 41, 90, 91]].isna().all()
+    assert not np.isnan(reference["RSI"].iloc[-1])
+
+
+def test_stream_indicators_matches_whole_series(indicators, tmp_path):
+    if not indicators.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    prices = _prices()
+    csv_path = tmp_path / "prices.csv"
+    prices.to_csv(csv_path, index=False)
+    db_path = tmp_path / "indicators.db"
+    output_path = tmp_path / ("indicators.parquet" if indicators.pq is not None else "indicators.csv")
+
+    # 7-row chunks put boundaries inside every 14-bar RSI/ATR warm-up window
+    rows = indicators.stream_indicators(str(csv_path), str(db_path), str(output_path), chunk_rows=7)
+    expected = indicators.calculate_indicators(indicators.load_data(str(csv_path)))
+
+    with sqlite3.connect(db_path) as conn:
+        stored = pd.read_sql("SELECT * FROM market_data", conn)
+    if indicators.pq is not None:
+        written = pd.read_parquet(output_path)
+    else:
+        written = pd.read_csv(output_path, parse_dates=["Date"], date_format="ISO8601")
+
+    assert rows == len(expected) == len(stored) == len(written)
+    assert stored["Date"].tolist() == expected["Date"].astype(str).tolist()
+    for column in ("Close", *indicators.INDICATOR_COLUMNS):
+        for result in (stored, written):
+            np.testing.assert_allclose(
+                result[column].to_numpy(dtype=float), expected[column].to_numpy(), rtol=1e-9, equal_nan=True, err_msg=column
+            )
@@ -4,6 +4,7 @@ Test module for retry utilities.
 This module contains tests for the retry and retry_with_result decorators.
 """
 
+import logging
 import unittest
 import time
 from unittest.mock import Mock, patch
@@ -80,5 +81,47 @@ class TestRetryDecorators(unittest.TestCase):
         self.assertEqual(mock_func.call_count, 3)
         self.assertEqual(mock_sleep.call_count, 2)  # Called twice for the two failures
 
+    def test_retry_jitter_spread_and_cap(self):
+        """Test that jitter adds up to 50% of the delay and delays never exceed max_delay."""
+        mock_func = Mock(side_effect=[ValueError("First failure"), ValueError("Second failure"), "success"])
+        mock_sleep = Mock()
+        
+        with patch('time.sleep', mock_sleep), patch('random.uniform', side_effect=lambda low, high: high):
+            @retry(max_tries=3, delay=10.0, backoff=3.0, exceptions=ValueError, jitter=True, max_delay=30.0)
+            def test_func():
+                return mock_func()
+            
+            result = test_func()
+        
+        self.assertEqual(result, "success")
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [15.0, 30.0])
+
+    def test_retry_with_result_caps_delay(self):
+        """Test that retry_with_result also caps its backoff at max_delay."""
+        mock_func = Mock(side_effect=[None, None, "data"])
+        mock_sleep = Mock()
+        
+        with patch('time.sleep', mock_sleep):
+            @retry_with_result(max_tries=3, delay=20.0, backoff=4.0, jitter=False, max_delay=30.0)
+            def test_func():
+                return mock_func()
+            
+            result = test_func()
+        
+        self.assertEqual(result, "data")
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [20.0, 30.0])
+
+    def test_retry_keeps_positional_logger_name(self):
+        """Test that max_delay was added after logger_name, so positional calls keep their meaning."""
+        mock_func = Mock(side_effect=[ValueError("First failure"), "success"])
+        
+        with patch('time.sleep'), patch('logging.getLogger', wraps=logging.getLogger) as get_logger:
+            @retry(3, 0.1, 2.0, ValueError, False, "retry_test")
+            def test_func():
+                return mock_func()
+            
+            self.assertEqual(test_func(), "success")
+        get_logger.assert_called_with("retry_test")
+
 if __name__ == '__main__':
     unittest.main()
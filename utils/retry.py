@@ -17,6 +17,16 @@ logger = logging.getLogger(__name__)
 # Type variable for generic function return type
 T = TypeVar('T')
 
+# Jitter adds up to this fraction of the delay, so concurrent callers that
+# failed together spread their retries out instead of retrying in lockstep
+JITTER_FRACTION = 0.5
+
+def _sleep_time(current_delay: float, jitter: bool, max_delay: float) -> float:
+    """Delay before the next attempt, with optional jitter, capped at max_delay."""
+    if jitter:
+        current_delay *= 1 + random.uniform(0, JITTER_FRACTION)
+    return min(current_delay, max_delay)
+
 class RetryError(Exception):
     """Exception raised when all retry attempts have failed."""
     
@@ -31,7 +41,8 @@ def retry(
     backoff: float = 2.0,
     exceptions: Union[Type[Exception], List[Type[Exception]]] = Exception,
     jitter: bool = True,
-    logger_name: Optional[str] = None
+    logger_name: Optional[str] = None,
+    max_delay: float = 30.0
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Retry decorator with exponential backoff for handling transient errors.
@@ -41,8 +52,9 @@ def retry(
         delay (float): Initial delay between retries in seconds.
         backoff (float): Backoff multiplier (e.g. value of 2 will double the delay each retry).
         exceptions (Exception or list): Exception(s) to catch and retry on.
-        jitter (bool): Whether to add random jitter to delay to prevent thundering herd problem.
+        jitter (bool): Whether to add random jitter (up to 50%) to delay to prevent thundering herd problem.
         logger_name (str, optional): Name of the logger to use. If None, uses the default logger.
+        max_delay (float): Upper bound on any single delay in seconds, jitter included.
     
     Returns:
         Callable: Decorated function with retry logic.
@@ -76,11 +88,7 @@ def retry(
                         break
                     
                     # Calculate next delay with optional jitter
-                    if jitter:
-                        # Add random jitter between 0% and 10% of the delay
-                        sleep_time = current_delay * (1 + random.uniform(0, 0.1))
-                    else:
-                        sleep_time = current_delay
+                    sleep_time = _sleep_time(current_delay, jitter, max_delay)
                     
                     retry_logger.warning(
                         f"Retry {tries}/{max_tries} for {func.__name__} after error: {str(e)}. "
@@ -106,7 +114,8 @@ def retry_with_result(
     backoff: float = 2.0,
     validator: Callable[[Any], bool] = lambda x: x is not None,
     jitter: bool = True,
-    logger_name: Optional[str] = None
+    logger_name: Optional[str] = None,
+    max_delay: float = 30.0
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Retry decorator that retries until a valid result is returned.
@@ -116,8 +125,9 @@ def retry_with_result(
         delay (float): Initial delay between retries in seconds.
         backoff (float): Backoff multiplier (e.g. value of 2 will double the delay each retry).
         validator (Callable): Function that takes the result and returns True if valid, False otherwise.
-        jitter (bool): Whether to add random jitter to delay to prevent thundering herd problem.
+        jitter (bool): Whether to add random jitter (up to 50%) to delay to prevent thundering herd problem.
         logger_name (str, optional): Name of the logger to use. If None, uses the default logger.
+        max_delay (float): Upper bound on any single delay in seconds, jitter included.
     
     Returns:
         Callable: Decorated function with retry logic based on result validation.
@@ -149,10 +159,7 @@ def retry_with_result(
                     break
                 
                 # Calculate next delay with optional jitter
-                if jitter:
-                    sleep_time = current_delay * (1 + random.uniform(0, 0.1))
-                else:
-                    sleep_time = current_delay
+                sleep_time = _sleep_time(current_delay, jitter, max_delay)
                 
                 retry_logger.warning(
                     f"Invalid result on attempt {tries}/{max_tries} for {func.__name__}. "